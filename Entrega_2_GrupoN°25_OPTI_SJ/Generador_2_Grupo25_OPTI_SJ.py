@@ -47,6 +47,20 @@ import json
 from datetime import datetime
 import argparse
 import os
+import sys
+from pathlib import Path
+
+# El formato de catalogo.json (campos, checksum, versión) se define sólo en
+# catalogo.py, en la raíz del proyecto. Si esta carpeta se usa por separado
+# (o con Python < 3.8) el generador no escribe el catálogo: las herramientas
+# del proyecto lo reconstruyen al cargarlo, o con
+#     python catalogo.py --reconstruir --directorio <directorio>
+try:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from catalogo import ARCHIVO_CATALOGO, entrada_instancia, escribir_catalogo
+except ImportError:
+    ARCHIVO_CATALOGO = 'catalogo.json'
+    entrada_instancia = escribir_catalogo = None
 
 class GeneradorInstanciasProfesor:
     def __init__(self, semilla=42):
@@ -209,6 +223,7 @@ class GeneradorInstanciasProfesor:
             os.makedirs(directorio_salida)
         
         resumen = []
+        catalogo = []
         
         for tamaño in ['pequeñas', 'medianas', 'grandes']:
             print(f"\n=== Generando instancias {tamaño.upper()} ===")
@@ -242,8 +257,16 @@ class GeneradorInstanciasProfesor:
                     'disposicion_promedio': np.mean(list(instancia['puntajes_disposicion'].values()))
                 }
                 resumen.append(stats)
+                if entrada_instancia is not None:
+                    catalogo.append(entrada_instancia(instancia, nombre_base, directorio_salida))
         
         self.generar_resumen(resumen, directorio_salida)
+        ruta_catalogo = os.path.join(directorio_salida, ARCHIVO_CATALOGO)
+        if escribir_catalogo is not None:
+            escribir_catalogo(catalogo, directorio_salida)
+        elif os.path.exists(ruta_catalogo):
+            # Un catálogo anterior tendría checksums de otras instancias
+            os.remove(ruta_catalogo)
         return resumen
     
     def generar_resumen(self, estadisticas, directorio):
@@ -274,6 +297,11 @@ def main():
     
     print(f"\n Generadas 15 instancias en directorio: {args.directorio}")
     print(f" Ver resumen en: {args.directorio}/resumen_instancias.md")
+    if escribir_catalogo is not None:
+        print(f" Catálogo de instancias: {args.directorio}/{ARCHIVO_CATALOGO}")
+    else:
+        print(" Catálogo no generado (catalogo.py no disponible); desde la raíz del proyecto:"
+              f" python catalogo.py --reconstruir --directorio {args.directorio}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
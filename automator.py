@@ -1,12 +1,124 @@
 import subprocess
 import os
+import re
+import signal
 import time
 import glob
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-def run_minizinc_with_solutions(model_file, dataset_file, output_file, timeout_ms, max_solutions=3):
+from catalogo import Catalogo
+
+# Configuración de tiempos por tipo (en milisegundos)
+TIMEOUT_CONFIG = {
+    "pequeñas": 5 * 60 * 1000,    # 5 minutos
+    "medianas": 10 * 60 * 1000,   # 10 minutos
+    "grandes": 25 * 60 * 1000     # 25 minutos
+}
+
+# Configuración de número de soluciones por tipo
+SOLUTIONS_CONFIG = {
+    "pequeñas": 3,   # Buscar hasta 3 soluciones para pequeñas
+    "medianas": 3,    # Buscar hasta 3 soluciones para medianas
+    "grandes": 1      # Buscar solo 1 solución para grandes (por tiempo)
+}
+
+# Tipos de datasets
+TIPOS = ["pequeñas", "medianas", "grandes"]
+
+# Versión mínima de MiniZinc: el modelo usa secciones de salida (output :: "json")
+# y el runner pasa --only-sections / --not-sections
+VERSION_MINIMA = (2, 6, 0)
+RE_VERSION = re.compile(r'version (\d+)\.(\d+)\.(\d+)')
+
+# Con la estrategia de búsqueda fija del modelo --random-seed no cambia nada:
+# las ejecuciones con semilla usan búsqueda libre (-f) para que la semilla
+# influya en la búsqueda (se puede cambiar con --opciones)
+OPCIONES_SEMILLAS = ['-f']
+
+# Cada cuántos segundos se revisa si una ejecución debe detenerse
+INTERVALO_DETENER = 1.0
+
+def nombre_resultado(tipo, n, sufijo=""):
+    """
+    Nombre del archivo de resultado: Resultado_pequeñao_01.txt (con 01),
+    más un sufijo opcional para distinguir solver/semilla/trabajo
+    """
+    tipo_singular = tipo[:-1] + 'o' if tipo.endswith('as') else tipo
+    return f"Resultado_{tipo_singular}_{n:02d}{sufijo}.txt"
+
+def _encabezado(dataset_file, solver, semilla, opciones=None):
+    encabezado = f"Dataset: {os.path.basename(dataset_file)}\n"
+    encabezado += f"Solver: {solver}\n"
+    if semilla is not None:
+        encabezado += f"Semilla: {semilla}\n"
+    if opciones:
+        encabezado += f"Opciones: {' '.join(opciones)}\n"
+    return encabezado
+
+def _terminar_proceso(proceso, forzar=False):
+    """
+    Termina MiniZinc y el solver que lanzó. En POSIX se envía la señal a
+    todo el grupo de procesos (ver start_new_session en _ejecutar_minizinc)
+    para no dejar al solver vivo con la salida abierta.
+    """
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(proceso.pid, signal.SIGKILL if forzar else signal.SIGTERM)
+        elif forzar:
+            proceso.kill()
+        else:
+            proceso.terminate()
+    except ProcessLookupError:
+        pass
+
+def _ejecutar_minizinc(cmd, limite_segundos, detener=None):
+    """
+    Equivalente a subprocess.run(cmd, capture_output=True, timeout=...)
+    que además revisa el evento detener (threading.Event) cada
+    INTERVALO_DETENER segundos y termina MiniZinc si se activa.
+    Devuelve (CompletedProcess, cancelada).
+    """
+    proceso = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='replace',  # Reemplazar caracteres problemáticos
+        start_new_session=True  # Grupo de procesos propio (sólo POSIX)
+    )
+    inicio = time.time()
+    while True:
+        try:
+            stdout, stderr = proceso.communicate(timeout=INTERVALO_DETENER)
+            return subprocess.CompletedProcess(cmd, proceso.returncode, stdout, stderr), False
+        except subprocess.TimeoutExpired:
+            cancelada = detener is not None and detener.is_set()
+            if not cancelada and time.time() - inicio <= limite_segundos:
+                continue
+            # SIGTERM primero para que MiniZinc cierre el solver; si no basta, SIGKILL
+            _terminar_proceso(proceso)
+            try:
+                stdout, stderr = proceso.communicate(timeout=5)
+            except subprocess.TimeoutExpired:
+                _terminar_proceso(proceso, forzar=True)
+                stdout, stderr = proceso.communicate()
+            if not cancelada:
+                raise subprocess.TimeoutExpired(cmd, limite_segundos, stdout, stderr)
+            return subprocess.CompletedProcess(cmd, proceso.returncode, stdout, stderr), True
+
+def run_minizinc_with_solutions(model_file, dataset_file, output_file, timeout_ms, max_solutions=3,
+                                salida_json=False, solver='chuffed', semilla=None, opciones=None,
+                                detener=None):
     """
-    Ejecuta MiniZinc buscando hasta max_solutions soluciones o hasta timeout
+    Ejecuta MiniZinc buscando hasta max_solutions soluciones o hasta timeout.
+    Con salida_json=True el modelo emite sólo su sección "json" (una línea
+    JSON por solución, ver solucion.py) en vez de la tabla de asignación.
+    semilla fija --random-seed y opciones agrega argumentos extra de MiniZinc.
+    Si el evento detener se activa (cola.py, lease perdido) MiniZinc se
+    termina y el resultado queda con status de error.
     """
     solutions_found = 0
     output_content = ""
@@ -15,7 +127,7 @@ def run_minizinc_with_solutions(model_file, dataset_file, output_file, timeout_m
         # Preparar comando base
         cmd = [
             'minizinc', 
-            '--solver', 'chuffed',
+            '--solver', solver,
             '--time-limit', str(timeout_ms),
             '--output-time',
             '--statistics'
@@ -24,19 +136,23 @@ def run_minizinc_with_solutions(model_file, dataset_file, output_file, timeout_m
         # Si queremos múltiples soluciones, añadir parámetro
         if max_solutions > 1:
             cmd.extend(['-a', '-n', str(max_solutions)])  # -a: todas las soluciones, -n: máximo número
+
+        # Elegir la sección de salida del modelo: JSON o tabla legible
+        if salida_json:
+            cmd.extend(['--only-sections', 'json'])
+        else:
+            cmd.extend(['--not-sections', 'json'])
+
+        if semilla is not None:
+            cmd.extend(['--random-seed', str(semilla)])
+        if opciones:
+            cmd.extend(opciones)
         
         cmd.extend([str(model_file), str(dataset_file)])
         
         # Ejecutar MiniZinc con codificación UTF-8 explícita
         start_time = time.time()
-        result = subprocess.run(
-            cmd, 
-            capture_output=True, 
-            text=True,
-            encoding='utf-8',
-            errors='replace',  # Reemplazar caracteres problemáticos
-            timeout=(timeout_ms/1000)+10
-        )
+        result, cancelada = _ejecutar_minizinc(cmd, (timeout_ms/1000)+10, detener)
         end_time = time.time()
         actual_time = end_time - start_time
         
@@ -61,12 +177,22 @@ def run_minizinc_with_solutions(model_file, dataset_file, output_file, timeout_m
             solutions_found = result.stdout.count('==========')
         
         # Preparar contenido del resultado
-        output_content = f"Dataset: {os.path.basename(dataset_file)}\n"
+        output_content = _encabezado(dataset_file, solver, semilla, opciones)
         output_content += f"Tiempo límite: {timeout_ms/1000/60:.1f} minutos\n"
         output_content += f"Tiempo total ejecución: {actual_time:.2f} segundos\n"
         output_content += f"Soluciones solicitadas: {max_solutions}\n"
         output_content += f"Soluciones encontradas: {solutions_found}\n"
-        output_content += f"Status: {'SOLUCIÓN(ES) ENCONTRADA(S)' if solutions_found > 0 else 'SIN SOLUCIONES'}\n"
+        # Un código de salida distinto de 0 (solver inexistente, error de
+        # aplanamiento, opciones inválidas) o =====ERROR===== es un error, no "sin soluciones"
+        if cancelada:
+            status = 'ERROR: EJECUCIÓN CANCELADA'
+        elif result.returncode != 0 or '=====ERROR=====' in result.stdout:
+            status = f"ERROR DE MINIZINC (código {result.returncode})"
+        elif solutions_found > 0:
+            status = 'SOLUCIÓN(ES) ENCONTRADA(S)'
+        else:
+            status = 'SIN SOLUCIONES'
+        output_content += f"Status: {status}\n"
         output_content += "=" * 60 + "\n"
         
         # Agregar estadísticas
@@ -85,7 +211,7 @@ def run_minizinc_with_solutions(model_file, dataset_file, output_file, timeout_m
             
     except subprocess.TimeoutExpired:
         actual_time = timeout_ms / 1000
-        output_content = f"Dataset: {os.path.basename(dataset_file)}\n"
+        output_content = _encabezado(dataset_file, solver, semilla, opciones)
         output_content += f"Tiempo límite: {timeout_ms/1000/60:.1f} minutos\n"
         output_content += f"Tiempo ejecución: {actual_time:.2f} segundos\n"
         output_content += f"Soluciones solicitadas: {max_solutions}\n"
@@ -95,7 +221,7 @@ def run_minizinc_with_solutions(model_file, dataset_file, output_file, timeout_m
         output_content += "El solver no encontró todas las soluciones dentro del tiempo límite\n"
     
     except UnicodeDecodeError as e:
-        output_content = f"Dataset: {os.path.basename(dataset_file)}\n"
+        output_content = _encabezado(dataset_file, solver, semilla, opciones)
         output_content += f"Tiempo límite: {timeout_ms/1000/60:.1f} minutos\n"
         output_content += "Status: ERROR DE CODIFICACIÓN\n"
         output_content += f"Soluciones solicitadas: {max_solutions}\n"
@@ -104,7 +230,7 @@ def run_minizinc_with_solutions(model_file, dataset_file, output_file, timeout_m
         output_content += "Sugerencia: El solver puede estar outputendo caracteres no UTF-8\n"
     
     except Exception as e:
-        output_content = f"Dataset: {os.path.basename(dataset_file)}\n"
+        output_content = _encabezado(dataset_file, solver, semilla, opciones)
         output_content += f"Tiempo límite: {timeout_ms/1000/60:.1f} minutos\n"
         output_content += "Status: ERROR EN LA EJECUCIÓN\n"
         output_content += f"Soluciones solicitadas: {max_solutions}\n"
@@ -126,12 +252,21 @@ def run_minizinc_with_solutions(model_file, dataset_file, output_file, timeout_m
     return output_content, solutions_found
 
 def check_dependencies():
-    """Verificar que MiniZinc esté disponible"""
+    """Verificar que MiniZinc esté disponible y sea al menos VERSION_MINIMA"""
     try:
         result = subprocess.run(['minizinc', '--version'], 
                               capture_output=True, text=True, timeout=10)
         if result.returncode == 0:
-            print("✅ MiniZinc encontrado")
+            match = RE_VERSION.search(result.stdout)
+            minima = '.'.join(map(str, VERSION_MINIMA))
+            if match is None:
+                print(f"⚠️  No se pudo leer la versión de MiniZinc (se requiere >= {minima})")
+                return True
+            version = tuple(int(g) for g in match.groups())
+            if version < VERSION_MINIMA:
+                print(f"❌ MiniZinc {'.'.join(map(str, version))} es muy antiguo: se requiere >= {minima}")
+                return False
+            print(f"✅ MiniZinc {'.'.join(map(str, version))} encontrado")
             return True
         else:
             print("❌ MiniZinc no responde correctamente")
@@ -144,6 +279,19 @@ def check_dependencies():
         return False
 
 def main():
+    parser = argparse.ArgumentParser(description='Ejecución automática de MiniZinc sobre las instancias')
+    parser.add_argument('--json', action='store_true',
+                        help='Usar la salida JSON del modelo (parseable con solucion.py)')
+    parser.add_argument('--semillas', type=int, default=0,
+                        help='Ejecutar cada instancia con N semillas (--random-seed); 0 = semilla del solver')
+    parser.add_argument('--semilla-base', type=int, default=1, help='Primera semilla a usar')
+    parser.add_argument('--opciones', type=str, default=None,
+                        help='Argumentos extra de MiniZinc, p. ej. --opciones="-f --restart luby" '
+                             f"(con --semillas, por defecto: {' '.join(OPCIONES_SEMILLAS)})")
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Ejecuciones simultáneas (cada una usa un núcleo)')
+    args = parser.parse_args()
+
     # Configuración de rutas
     BASE_DIR = Path(".").resolve()
     INSTANCIAS_DIR = BASE_DIR / "instancias"
@@ -166,27 +314,15 @@ def main():
     # Crear directorio de resultados si no existe
     RESULTADOS_DIR.mkdir(exist_ok=True)
     
-    # Configuración de tiempos por tipo (en milisegundos)
-    TIMEOUT_CONFIG = {
-        "pequeñas": 5 * 60 * 1000,    # 5 minutos
-        "medianas": 10 * 60 * 1000,   # 10 minutos  
-        "grandes": 25 * 60 * 1000     # 25 minutos
-    }
-    
-    # Configuración de número de soluciones por tipo
-    SOLUTIONS_CONFIG = {
-        "pequeñas": 3,   # Buscar hasta 3 soluciones para pequeñas
-        "medianas": 3,    # Buscar hasta 3 soluciones para medianas  
-        "grandes": 1      # Buscar solo 1 solución para grandes (por tiempo)
-    }
-    
-    # Tipos de datasets
-    TIPOS = ["pequeñas", "medianas", "grandes"]
-    
     print("\n🚀 Iniciando ejecución automática de MiniZinc")
     print(f"📁 Instancias: {INSTANCIAS_DIR}")
     print(f"📊 Resultados: {RESULTADOS_DIR}")
     print(f"🔧 Modelo: {MODEL_FILE}")
+    print(f"🧾 Salida: {'JSON' if args.json else 'tabla'}")
+    if args.opciones is not None:
+        print(f"⚙️  Opciones: {args.opciones or '(ninguna)'}")
+    elif args.semillas:
+        print(f"⚙️  Opciones: {' '.join(OPCIONES_SEMILLAS)} (búsqueda libre para que las semillas tengan efecto)")
     print("-" * 60)
     
     # Estadísticas
@@ -198,41 +334,53 @@ def main():
         "soluciones_totales": 0
     }
     
-    # Procesar cada tipo de dataset
+    # Armar la lista de ejecuciones: cada instancia × cada semilla
+    semillas = [args.semilla_base + i for i in range(args.semillas)] if args.semillas else [None]
+    if args.opciones is not None:
+        opciones = args.opciones.split()
+    else:
+        opciones = OPCIONES_SEMILLAS if args.semillas else []
+    catalogo = Catalogo.cargar(INSTANCIAS_DIR)
+    ejecuciones = []
     for tipo in TIPOS:
-        print(f"\n📂 Procesando datasets {tipo}...")
-        timeout_ms = TIMEOUT_CONFIG[tipo]
-        max_solutions = SOLUTIONS_CONFIG[tipo]
-        
-        for n in range(1, 6):  # n del 1 al 5
-            # Formato del archivo: pequeñas_01.dzn, pequeñas_02.dzn, etc.
-            dataset_pattern = f"{tipo}_{n:02d}.dzn"
-            dataset_files = list(INSTANCIAS_DIR.glob(dataset_pattern))
+        instancias = catalogo.filtrar(tipo=tipo)
+        if not instancias:
+            print(f"  ⚠️  No hay instancias {tipo} en el catálogo")
+            continue
             
-            if not dataset_files:
-                print(f"  ⚠️  No se encontró: {dataset_pattern}")
-                continue
-                
-            dataset_file = dataset_files[0]
+        for instancia in instancias:
+            for semilla in semillas:
+                sufijo = f"_s{semilla}" if semilla is not None else ""
+                output_file = RESULTADOS_DIR / nombre_resultado(tipo, instancia.numero, sufijo)
+                ejecuciones.append((tipo, instancia.ruta_dzn, semilla, output_file))
+    
+    print(f"📋 {len(ejecuciones)} ejecuciones ({len(semillas)} semilla(s) por instancia, "
+          f"{args.workers} en paralelo)")
+    
+    def ejecutar(tipo, dataset_file, semilla, output_file):
+        # Ejecutar MiniZinc
+        return run_minizinc_with_solutions(
+            MODEL_FILE, 
+            dataset_file, 
+            output_file, 
+            TIMEOUT_CONFIG[tipo],
+            SOLUTIONS_CONFIG[tipo],
+            salida_json=args.json,
+            semilla=semilla,
+            opciones=opciones
+        )
+    
+    # Las ejecuciones son procesos externos: basta con hilos para lanzarlas en paralelo
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        tareas = {pool.submit(ejecutar, *ejecucion): ejecucion for ejecucion in ejecuciones}
+        for tarea in as_completed(tareas):
+            tipo, dataset_file, semilla, output_file = tareas[tarea]
             stats["total"] += 1
-            
-            # Nombre del archivo de resultado: Resultado_pequeño_01.txt (con 01)
-            tipo_singular = tipo[:-1] + 'o' if tipo.endswith('as') else tipo
-            output_filename = f"Resultado_{tipo_singular}_{n:02d}.txt"
-            output_file = RESULTADOS_DIR / output_filename
-            
-            print(f"  🔄 Ejecutando: {dataset_file.name}")
-            print(f"    ⏰ Timeout: {timeout_ms/60000:.0f}min, Soluciones: {max_solutions}")
+            etiqueta = dataset_file.name if semilla is None else f"{dataset_file.name} (semilla {semilla})"
+            print(f"  🔄 Terminado: {etiqueta}")
             
             try:
-                # Ejecutar MiniZinc
-                result, solutions_found = run_minizinc_with_solutions(
-                    MODEL_FILE, 
-                    dataset_file, 
-                    output_file, 
-                    timeout_ms,
-                    max_solutions
-                )
+                result, solutions_found = tarea.result()
                 
                 stats["soluciones_totales"] += solutions_found
                 
@@ -258,7 +406,7 @@ def main():
     # Resumen final
     print("\n" + "=" * 60)
     print("📊 RESUMEN EJECUCIÓN")
-    print(f"   Total datasets procesados: {stats['total']}")
+    print(f"   Total ejecuciones procesadas: {stats['total']}")
     print(f"   Ejecuciones completadas: {stats['completados']}")
     print(f"   Timeouts: {stats['timeouts']}")
     print(f"   Errores: {stats['errores']}")
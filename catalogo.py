@@ -0,0 +1,218 @@
+"""
+Catálogo indexado de instancias.
+
+El generador escribe instancias/catalogo.json: una lista compacta con los
+metadatos de cada instancia (tamaño, trabajadores, días, turnos, demanda
+total, checksum del .dzn y rutas). Las herramientas seleccionan y filtran
+instancias leyendo sólo ese archivo; el JSON completo de una instancia (con
+los puntajes) se carga únicamente cuando se pide.
+
+Uso:
+    python catalogo.py --directorio instancias          # reconstruir el índice
+    python catalogo.py --tipo grandes --min-trabajadores 50
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from functools import cached_property
+from pathlib import Path
+
+ARCHIVO_CATALOGO = 'catalogo.json'
+VERSION_CATALOGO = 1
+
+RE_NOMBRE = re.compile(r'(.+)_(\d+)$')
+
+
+def checksum_archivo(ruta):
+    """SHA-256 del contenido de un archivo"""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def entrada_instancia(instancia, nombre_base, directorio):
+    """
+    Entrada de catálogo a partir de una instancia en memoria (el formato
+    JSON del generador) ya escrita como <nombre_base>.json/.dzn en directorio
+    """
+    meta = instancia['metadata']
+    match = RE_NOMBRE.match(nombre_base)
+    puntajes = instancia['puntajes_disposicion'].values()
+    return {
+        'nombre': nombre_base,
+        'tipo': match.group(1) if match else meta['tamaño'].lower(),
+        'numero': meta['numero_instancia'],
+        'trabajadores': meta['num_trabajadores'],
+        'dias': meta['horizonte_dias'],
+        'semanas': meta['num_semanas'],
+        'turnos': meta['turnos'],
+        'demanda_total': sum(instancia['demanda'].values()),
+        'disposicion_promedio': round(sum(puntajes) / len(puntajes), 3),
+        'checksum': checksum_archivo(Path(directorio) / f"{nombre_base}.dzn"),
+        'dzn': f"{nombre_base}.dzn",
+        'json': f"{nombre_base}.json",
+    }
+
+
+def escribir_catalogo(entradas, directorio):
+    """Escribe el índice compacto en <directorio>/catalogo.json"""
+    ruta = Path(directorio) / ARCHIVO_CATALOGO
+    contenido = {'version': VERSION_CATALOGO, 'instancias': entradas}
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(contenido, f, ensure_ascii=False, separators=(',', ':'))
+    return ruta
+
+
+def construir_catalogo(directorio):
+    """
+    Reconstruye el índice recorriendo los .json de un directorio (para
+    directorios generados antes de que existiera el catálogo)
+    """
+    entradas = []
+    for ruta_json in sorted(Path(directorio).glob('*.json')):
+        if ruta_json.name == ARCHIVO_CATALOGO or not ruta_json.with_suffix('.dzn').exists():
+            continue
+        with open(ruta_json, 'r', encoding='utf-8') as f:
+            instancia = json.load(f)
+        entradas.append(entrada_instancia(instancia, ruta_json.stem, directorio))
+    return escribir_catalogo(entradas, directorio)
+
+
+class Instancia:
+    """
+    Entrada del catálogo. Los metadatos están disponibles como atributos;
+    el JSON completo y los arreglos NumPy se cargan al primer uso.
+    """
+
+    def __init__(self, entrada, directorio):
+        self.entrada = entrada
+        self.directorio = Path(directorio)
+        self.nombre = entrada['nombre']
+        self.tipo = entrada['tipo']
+        self.numero = entrada['numero']
+        self.trabajadores = entrada['trabajadores']
+        self.dias = entrada['dias']
+        self.semanas = entrada['semanas']
+        self.turnos = entrada['turnos']
+        self.demanda_total = entrada['demanda_total']
+        self.checksum = entrada['checksum']
+
+    def __repr__(self):
+        return (f"Instancia({self.nombre}: {self.trabajadores} trabajadores, "
+                f"{self.dias} días, {len(self.turnos)} turnos)")
+
+    @property
+    def ruta_dzn(self):
+        return self.directorio / self.entrada['dzn']
+
+    @property
+    def ruta_json(self):
+        return self.directorio / self.entrada['json']
+
+    @cached_property
+    def datos(self):
+        """JSON completo de la instancia (incluye los puntajes)"""
+        with open(self.ruta_json, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @cached_property
+    def _arrays(self):
+        from solucion import arrays_instancia
+        return arrays_instancia(self.datos)
+
+    @property
+    def demanda(self):
+        """Demanda como arreglo (D, T)"""
+        return self._arrays[0]
+
+    @property
+    def puntajes(self):
+        """Puntajes de disposición como arreglo (P, D, T)"""
+        return self._arrays[1]
+
+    def verificar(self):
+        """True si el .dzn en disco coincide con el checksum del catálogo"""
+        return checksum_archivo(self.ruta_dzn) == self.checksum
+
+
+class Catalogo:
+    """Conjunto de instancias de un directorio, leído desde su índice"""
+
+    def __init__(self, instancias, directorio):
+        self.directorio = Path(directorio)
+        self.instancias = instancias
+        self._por_nombre = {inst.nombre: inst for inst in instancias}
+
+    @classmethod
+    def cargar(cls, directorio='instancias'):
+        """
+        Lee <directorio>/catalogo.json; si no existe lo construye a partir
+        de las instancias del directorio
+        """
+        directorio = Path(directorio)
+        ruta = directorio / ARCHIVO_CATALOGO
+        if not ruta.exists():
+            construir_catalogo(directorio)
+        with open(ruta, 'r', encoding='utf-8') as f:
+            contenido = json.load(f)
+        instancias = [Instancia(entrada, directorio) for entrada in contenido['instancias']]
+        return cls(instancias, directorio)
+
+    def __iter__(self):
+        return iter(self.instancias)
+
+    def __len__(self):
+        return len(self.instancias)
+
+    def por_nombre(self, nombre):
+        """Instancia por nombre base ('pequeñas_01'); acepta también 'pequeñas_01.dzn'"""
+        return self._por_nombre.get(Path(nombre).stem)
+
+    def filtrar(self, tipo=None, min_trabajadores=None, max_trabajadores=None,
+                min_dias=None, max_dias=None, num_turnos=None):
+        """Instancias que cumplen todos los filtros dados, ordenadas por tipo y número"""
+        tipos = [tipo] if isinstance(tipo, str) else tipo
+        seleccion = [
+            inst for inst in self.instancias
+            if (tipos is None or inst.tipo in tipos)
+            and (min_trabajadores is None or inst.trabajadores >= min_trabajadores)
+            and (max_trabajadores is None or inst.trabajadores <= max_trabajadores)
+            and (min_dias is None or inst.dias >= min_dias)
+            and (max_dias is None or inst.dias <= max_dias)
+            and (num_turnos is None or len(inst.turnos) == num_turnos)
+        ]
+        return sorted(seleccion, key=lambda inst: (inst.tipo, inst.numero))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Catálogo indexado de instancias')
+    parser.add_argument('--directorio', type=str, default='instancias', help='Directorio de instancias')
+    parser.add_argument('--reconstruir', action='store_true', help='Reconstruir el índice desde los .json')
+    parser.add_argument('--tipo', type=str, nargs='*', default=None)
+    parser.add_argument('--min-trabajadores', type=int, default=None)
+    parser.add_argument('--max-trabajadores', type=int, default=None)
+    parser.add_argument('--verificar', action='store_true', help='Comprobar los checksums de los .dzn')
+    args = parser.parse_args()
+
+    if args.reconstruir:
+        ruta = construir_catalogo(args.directorio)
+        print(f"📇 Catálogo escrito en: {ruta}")
+
+    catalogo = Catalogo.cargar(args.directorio)
+    seleccion = catalogo.filtrar(tipo=args.tipo, min_trabajadores=args.min_trabajadores,
+                                 max_trabajadores=args.max_trabajadores)
+    print(f"📇 {len(seleccion)} de {len(catalogo)} instancias")
+    for inst in seleccion:
+        estado = ''
+        if args.verificar:
+            estado = ' ✅' if inst.verificar() else ' ❌ checksum distinto'
+        print(f"  {inst.nombre}: {inst.trabajadores} trabajadores, {inst.dias} días, "
+              f"{len(inst.turnos)} turnos, demanda {inst.demanda_total}{estado}")
+
+
+if __name__ == "__main__":
+    main()
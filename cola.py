@@ -0,0 +1,430 @@
+"""
+Cola de trabajos para ejecutar barridos (instancias × solvers × semillas ×
+opciones) en varias máquinas.
+
+La cola es una base SQLite. Un coordinador publica los trabajos; cada
+trabajador toma un trabajo con un lease (préstamo con vencimiento), ejecuta
+MiniZinc con el modelo y el .dzn compartidos y devuelve un resumen
+estructurado. Si un trabajador muere, su lease vence y el trabajo vuelve a
+quedar disponible hasta agotar max_intentos. Si un trabajador no logra
+renovar su lease, detiene MiniZinc y abandona el trabajo; cada intento
+escribe su propio Resultado_..._j<id>_i<intento>.txt.
+
+Requisitos para usarla desde varias máquinas:
+- La base debe estar en un disco local del host que la abre, o en un
+  sistema de archivos con bloqueos POSIX confiables. NFS suele no
+  cumplirlo y una carpeta sincronizada (Dropbox, Drive, Syncthing...)
+  corrompe la base: en esos casos la garantía de BEGIN IMMEDIATE de que
+  dos trabajadores no toman el mismo trabajo no se cumple.
+- Los leases comparan time.time() de hosts distintos: los relojes deben
+  estar sincronizados (NTP) y el desfase ser muy menor que --lease; si no,
+  un lease vivo puede darse por vencido y el trabajo ejecutarse dos veces.
+
+Uso:
+    python cola.py publicar --db cola.sqlite --solvers chuffed gecode --semillas 1 2 3
+    python cola.py publicar --db cola.sqlite --semillas 1 2 3 --opciones="-f --restart luby"
+    python cola.py trabajador --db cola.sqlite
+    python cola.py estado --db cola.sqlite
+    python cola.py exportar --db cola.sqlite --salida resultados_cola.csv
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from catalogo import Catalogo
+from automator import (TIMEOUT_CONFIG, SOLUTIONS_CONFIG, TIPOS, OPCIONES_SEMILLAS,
+                       check_dependencies, nombre_resultado, run_minizinc_with_solutions)
+
+# Duración del lease: el trabajador lo renueva mientras MiniZinc corre
+LEASE_SEGUNDOS = 120
+MAX_INTENTOS = 3
+# Espera entre consultas cuando la cola está vacía pero hay trabajos en curso
+ESPERA_SEGUNDOS = 30
+
+# Caracteres de stderr que se guardan como error de un trabajo
+MAX_LARGO_ERROR = 2000
+
+RE_INSTANCIA = re.compile(r'(.+)_(\d+)\.dzn$')
+
+# Valor de "semilla" para trabajos sin semilla fija (NULL rompería la clave
+# única: SQLite considera distintos dos NULL)
+SIN_SEMILLA = -1
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS trabajos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    instancia TEXT NOT NULL,
+    modelo TEXT NOT NULL,
+    solver TEXT NOT NULL,
+    semilla INTEGER NOT NULL DEFAULT -1,
+    opciones TEXT NOT NULL DEFAULT '[]',
+    timeout_ms INTEGER NOT NULL,
+    max_soluciones INTEGER NOT NULL,
+    salida_json INTEGER NOT NULL DEFAULT 0,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    intentos INTEGER NOT NULL DEFAULT 0,
+    max_intentos INTEGER NOT NULL DEFAULT 3,
+    trabajador TEXT,
+    lease_hasta REAL,
+    archivo TEXT,
+    resultado TEXT,
+    error TEXT,
+    creado REAL NOT NULL,
+    actualizado REAL NOT NULL,
+    UNIQUE (instancia, modelo, solver, semilla, opciones, timeout_ms, max_soluciones, salida_json)
+);
+CREATE INDEX IF NOT EXISTS idx_trabajos_estado ON trabajos (estado, lease_hasta);
+"""
+
+
+class ColaTrabajos:
+    """
+    Cola de trabajos sobre SQLite. Todas las transiciones de estado
+    ocurren dentro de transacciones BEGIN IMMEDIATE, por lo que varios
+    trabajadores pueden compartir la misma base sin tomar el mismo trabajo.
+    """
+
+    def __init__(self, ruta_db, lease_segundos=LEASE_SEGUNDOS):
+        self.ruta_db = str(ruta_db)
+        self.lease_segundos = lease_segundos
+        self.conexion = sqlite3.connect(self.ruta_db, timeout=60, isolation_level=None)
+        self.conexion.row_factory = sqlite3.Row
+        self.conexion.executescript(ESQUEMA)
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def _transaccion(self, funcion, *args):
+        cursor = self.conexion.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            resultado = funcion(cursor, *args)
+            cursor.execute("COMMIT")
+            return resultado
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def publicar(self, trabajos, max_intentos=MAX_INTENTOS):
+        """
+        Publica una lista de trabajos (diccionarios con instancia, modelo,
+        solver, semilla, opciones, timeout_ms, max_soluciones, salida_json).
+        Los trabajos ya publicados se ignoran. Devuelve cuántos se agregaron.
+        """
+        ahora = time.time()
+        filas = [(
+            t['instancia'], t['modelo'], t['solver'],
+            SIN_SEMILLA if t.get('semilla') is None else t['semilla'],
+            json.dumps(t.get('opciones') or []), t['timeout_ms'], t['max_soluciones'],
+            int(t.get('salida_json', False)), max_intentos, ahora, ahora
+        ) for t in trabajos]
+
+        def _insertar(cursor):
+            antes = self.conexion.total_changes
+            cursor.executemany("""
+                INSERT OR IGNORE INTO trabajos
+                    (instancia, modelo, solver, semilla, opciones, timeout_ms,
+                     max_soluciones, salida_json, max_intentos, creado, actualizado)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, filas)
+            return self.conexion.total_changes - antes
+
+        return self._transaccion(_insertar)
+
+    def tomar(self, trabajador):
+        """
+        Toma el siguiente trabajo disponible (pendiente o con lease vencido)
+        y lo marca en curso a nombre del trabajador. Devuelve None si no hay.
+        """
+        def _tomar(cursor):
+            ahora = time.time()
+            # Leases vencidos sin intentos restantes: se dan por fallidos
+            cursor.execute("""
+                UPDATE trabajos SET estado = 'fallido', actualizado = ?,
+                       error = COALESCE(error, 'lease vencido')
+                WHERE estado = 'en_curso' AND lease_hasta < ? AND intentos >= max_intentos
+            """, (ahora, ahora))
+            fila = cursor.execute("""
+                SELECT * FROM trabajos
+                WHERE (estado = 'pendiente' OR (estado = 'en_curso' AND lease_hasta < ?))
+                  AND intentos < max_intentos
+                ORDER BY id LIMIT 1
+            """, (ahora,)).fetchone()
+            if fila is None:
+                return None
+            cursor.execute("""
+                UPDATE trabajos SET estado = 'en_curso', trabajador = ?, lease_hasta = ?,
+                       intentos = intentos + 1, actualizado = ?
+                WHERE id = ?
+            """, (trabajador, ahora + self.lease_segundos, ahora, fila['id']))
+            trabajo = dict(fila)
+            trabajo['opciones'] = json.loads(trabajo['opciones'])
+            if trabajo['semilla'] == SIN_SEMILLA:
+                trabajo['semilla'] = None
+            trabajo['intentos'] += 1
+            return trabajo
+
+        return self._transaccion(_tomar)
+
+    def renovar(self, id_trabajo, trabajador):
+        """Extiende el lease de un trabajo en curso. False si ya no es del trabajador."""
+        ahora = time.time()
+        cursor = self.conexion.execute("""
+            UPDATE trabajos SET lease_hasta = ?, actualizado = ?
+            WHERE id = ? AND trabajador = ? AND estado = 'en_curso'
+        """, (ahora + self.lease_segundos, ahora, id_trabajo, trabajador))
+        return cursor.rowcount == 1
+
+    def completar(self, id_trabajo, trabajador, resultado, archivo):
+        """Registra el resumen estructurado de un trabajo terminado"""
+        cursor = self.conexion.execute("""
+            UPDATE trabajos SET estado = 'completado', resultado = ?, archivo = ?,
+                   lease_hasta = NULL, error = NULL, actualizado = ?
+            WHERE id = ? AND trabajador = ? AND estado = 'en_curso'
+        """, (json.dumps(resultado, ensure_ascii=False), str(archivo), time.time(),
+              id_trabajo, trabajador))
+        return cursor.rowcount == 1
+
+    def fallar(self, id_trabajo, trabajador, error):
+        """
+        Registra un error. El trabajo vuelve a 'pendiente' si le quedan
+        intentos, si no queda 'fallido'.
+        """
+        cursor = self.conexion.execute("""
+            UPDATE trabajos SET
+                estado = CASE WHEN intentos < max_intentos THEN 'pendiente' ELSE 'fallido' END,
+                error = ?, lease_hasta = NULL, actualizado = ?
+            WHERE id = ? AND trabajador = ? AND estado = 'en_curso'
+        """, (str(error), time.time(), id_trabajo, trabajador))
+        return cursor.rowcount == 1
+
+    def estado(self):
+        """Cantidad de trabajos por estado"""
+        filas = self.conexion.execute(
+            "SELECT estado, COUNT(*) AS n FROM trabajos GROUP BY estado").fetchall()
+        return {fila['estado']: fila['n'] for fila in filas}
+
+    def resultados(self):
+        """Trabajos completados con su resumen, como lista de diccionarios"""
+        filas = self.conexion.execute("""
+            SELECT id, instancia, solver, semilla, opciones, trabajador, intentos, archivo, resultado
+            FROM trabajos WHERE estado = 'completado' ORDER BY id
+        """).fetchall()
+        registros = []
+        for fila in filas:
+            registro = dict(fila)
+            if registro['semilla'] == SIN_SEMILLA:
+                registro['semilla'] = None
+            registro.update(json.loads(registro.pop('resultado')))
+            registros.append(registro)
+        return registros
+
+
+def crear_trabajos(instancias, modelo, solvers, semillas, opciones, salida_json=False):
+    """
+    Producto instancias × solvers × semillas × opciones. Las rutas se
+    guardan relativas al directorio base compartido.
+    """
+    trabajos = []
+    for instancia in instancias:
+        match = RE_INSTANCIA.search(Path(instancia).name)
+        tipo = match.group(1) if match else None
+        for solver in solvers:
+            for semilla in semillas:
+                for extra in opciones:
+                    trabajos.append({
+                        'instancia': str(instancia),
+                        'modelo': str(modelo),
+                        'solver': solver,
+                        'semilla': semilla,
+                        'opciones': extra.split(),
+                        'timeout_ms': TIMEOUT_CONFIG.get(tipo, TIMEOUT_CONFIG['grandes']),
+                        'max_soluciones': SOLUTIONS_CONFIG.get(tipo, 1),
+                        'salida_json': salida_json,
+                    })
+    return trabajos
+
+
+def _resumen_resultado(archivo):
+    # Importación diferida: generadorGrafico carga pandas y matplotlib
+    from generadorGrafico import parse_result_file
+    return parse_result_file(archivo)
+
+
+def _mensaje_error(contenido, output_file):
+    """Error a guardar en la cola: el stderr de MiniZinc (o la línea Error:) del resultado"""
+    if '[ERRORES]' in contenido:
+        detalle = contenido.split('[ERRORES]', 1)[1].strip()
+    else:
+        detalle = '\n'.join(l for l in contenido.splitlines()
+                             if l.startswith(('Status:', 'Error:')))
+    return f"{detalle[-MAX_LARGO_ERROR:]}\n(ver {output_file})"
+
+
+def ejecutar_trabajo(cola, trabajo, trabajador, base_dir, resultados_dir):
+    """
+    Ejecuta un trabajo renovando su lease mientras MiniZinc corre y
+    devuelve el resultado a la cola
+    """
+    instancia = Path(trabajo['instancia'])
+    match = RE_INSTANCIA.search(instancia.name)
+    tipo, n = (match.group(1), int(match.group(2))) if match else (instancia.stem, 0)
+    sufijo = f"_{trabajo['solver']}"
+    if trabajo['semilla'] is not None:
+        sufijo += f"_s{trabajo['semilla']}"
+    # El intento va en el nombre: si el lease se pierde y otro trabajador
+    # retoma el trabajo, cada intento escribe su propio archivo
+    sufijo += f"_j{trabajo['id']}_i{trabajo['intentos']}"
+    output_file = Path(resultados_dir) / nombre_resultado(tipo, n, sufijo)
+
+    salida = {}
+    detener = threading.Event()
+
+    def _ejecutar():
+        try:
+            salida['contenido'], salida['soluciones'] = run_minizinc_with_solutions(
+                base_dir / trabajo['modelo'],
+                base_dir / instancia,
+                output_file,
+                trabajo['timeout_ms'],
+                trabajo['max_soluciones'],
+                salida_json=bool(trabajo['salida_json']),
+                solver=trabajo['solver'],
+                semilla=trabajo['semilla'],
+                opciones=trabajo['opciones'],
+                detener=detener
+            )
+        except Exception as e:
+            salida['error'] = e
+
+    hilo = threading.Thread(target=_ejecutar, daemon=True)
+    hilo.start()
+    while hilo.is_alive():
+        hilo.join(timeout=cola.lease_segundos / 3)
+        if hilo.is_alive() and not cola.renovar(trabajo['id'], trabajador):
+            # El trabajo ya puede estar en manos de otro trabajador: no seguir
+            print(f"    ⚠️  Lease perdido para trabajo {trabajo['id']}: se detiene MiniZinc")
+            detener.set()
+            hilo.join()
+
+    if detener.is_set():
+        return False
+    if 'error' in salida:
+        cola.fallar(trabajo['id'], trabajador, salida['error'])
+        return False
+    if "Status: ERROR" in salida['contenido']:
+        cola.fallar(trabajo['id'], trabajador, _mensaje_error(salida['contenido'], output_file))
+        return False
+
+    try:
+        resumen = _resumen_resultado(output_file)
+    except Exception as e:
+        # Sin esto el trabajo quedaría en_curso hasta que venza el lease
+        cola.fallar(trabajo['id'], trabajador, f"Error resumiendo {output_file}: {e!r}")
+        return False
+    return cola.completar(trabajo['id'], trabajador, resumen, os.path.relpath(output_file, base_dir))
+
+
+def trabajar(cola, trabajador, base_dir, resultados_dir, continuar=False):
+    """
+    Bucle del trabajador: toma y ejecuta trabajos hasta que la cola se
+    vacíe (o indefinidamente con continuar=True)
+    """
+    resultados_dir.mkdir(parents=True, exist_ok=True)
+    completados = 0
+    while True:
+        trabajo = cola.tomar(trabajador)
+        if trabajo is None:
+            # Mientras otros trabajadores tengan trabajos en curso, su lease
+            # puede vencer y el trabajo volver a la cola
+            if not continuar and not cola.estado().get('en_curso'):
+                break
+            time.sleep(ESPERA_SEGUNDOS)
+            continue
+
+        print(f"  🔄 [{trabajador}] Trabajo {trabajo['id']}: {trabajo['instancia']} "
+              f"({trabajo['solver']}, semilla {trabajo['semilla']}, intento {trabajo['intentos']})")
+        if ejecutar_trabajo(cola, trabajo, trabajador, base_dir, resultados_dir):
+            completados += 1
+            print(f"    ✅ Trabajo {trabajo['id']} completado")
+        else:
+            print(f"    ❌ Trabajo {trabajo['id']} falló")
+    return completados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cola de trabajos MiniZinc para varias máquinas')
+    parser.add_argument('accion', choices=['publicar', 'trabajador', 'estado', 'exportar'])
+    parser.add_argument('--db', type=str, default='cola.sqlite', help='Base SQLite compartida')
+    parser.add_argument('--base', type=str, default='.', help='Directorio base compartido (modelo e instancias)')
+    # publicar
+    parser.add_argument('--modelo', type=str, default='modelo.mzn', help='Modelo, relativo a --base')
+    parser.add_argument('--instancias', type=str, default='instancias', help='Directorio de .dzn, relativo a --base')
+    parser.add_argument('--tipos', type=str, nargs='*', default=TIPOS, help='Tipos de instancia a incluir')
+    parser.add_argument('--min-trabajadores', type=int, default=None)
+    parser.add_argument('--max-trabajadores', type=int, default=None)
+    parser.add_argument('--solvers', type=str, nargs='*', default=['chuffed'])
+    parser.add_argument('--semillas', type=int, nargs='*', default=[1])
+    parser.add_argument('--opciones', type=str, nargs='*', default=None,
+                        help='Variantes de argumentos extra de MiniZinc (una por estrategia); con '
+                             f"varias semillas, por defecto: {' '.join(OPCIONES_SEMILLAS)}")
+    parser.add_argument('--json', action='store_true', help='Usar la salida JSON del modelo')
+    parser.add_argument('--max-intentos', type=int, default=MAX_INTENTOS)
+    # trabajador
+    parser.add_argument('--nombre', type=str, default=f"{socket.gethostname()}-{os.getpid()}")
+    parser.add_argument('--resultados', type=str, default='ResultadosCola', help='Directorio de resultados, relativo a --base')
+    parser.add_argument('--continuar', action='store_true', help='Seguir esperando trabajos nuevos')
+    parser.add_argument('--lease', type=int, default=LEASE_SEGUNDOS, help='Duración del lease en segundos')
+    # exportar
+    parser.add_argument('--salida', type=str, default='resultados_cola.csv')
+    args = parser.parse_args()
+
+    base_dir = Path(args.base).resolve()
+    cola = ColaTrabajos(args.db, lease_segundos=args.lease)
+
+    try:
+        if args.accion == 'publicar':
+            catalogo = Catalogo.cargar(base_dir / args.instancias)
+            instancias = [
+                inst.ruta_dzn.relative_to(base_dir)
+                for inst in catalogo.filtrar(tipo=args.tipos, min_trabajadores=args.min_trabajadores,
+                                             max_trabajadores=args.max_trabajadores)
+            ]
+            # Igual que automator: sin búsqueda libre las semillas no cambian nada
+            opciones = args.opciones
+            if opciones is None:
+                opciones = [' '.join(OPCIONES_SEMILLAS)] if len(args.semillas) > 1 else ['']
+            trabajos = crear_trabajos(instancias, args.modelo, args.solvers, args.semillas,
+                                      opciones, args.json)
+            agregados = cola.publicar(trabajos, max_intentos=args.max_intentos)
+            print(f"📤 Publicados {agregados} trabajos nuevos ({len(trabajos) - agregados} ya existían)")
+
+        elif args.accion == 'trabajador':
+            print("🔍 Verificando dependencias...")
+            if not check_dependencies():
+                return
+            completados = trabajar(cola, args.nombre, base_dir, base_dir / args.resultados, args.continuar)
+            print(f"🏁 [{args.nombre}] Trabajos completados: {completados}")
+
+        elif args.accion == 'estado':
+            for estado, n in sorted(cola.estado().items()):
+                print(f"   {estado}: {n}")
+
+        elif args.accion == 'exportar':
+            import pandas as pd
+            df = pd.DataFrame(cola.resultados())
+            df.to_csv(args.salida, index=False)
+            print(f"📄 {len(df)} resultados exportados a {args.salida}")
+    finally:
+        cola.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,214 +1,716 @@
 import os
 import re
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')  # Render sin ventana: permite generar gráficos en procesos paralelos
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-from pathlib import Path
+
+# Expresiones precompiladas para el recorrido línea a línea
+RE_RESULTADO = re.compile(r'Resultado_(.+?)_(\d+)')
+RE_PUNTAJE = re.compile(r'Puntaje total: (\d+)')
+RE_ELAPSED = re.compile(r'% time elapsed: ([\d.]+) s')
+RE_STAT = re.compile(r'%%%mzn-stat: (\w+)=(\S+)')
+RE_NUMERO = re.compile(r'([\d.]+)')
+
+# Bloque inicial (en bytes) para leer el final del archivo; se duplica hasta
+# encontrar el bloque nSolutions que MiniZinc deja al final de la salida
+BYTES_COLA = 4096
+
+# Columnas del DataFrame de resultados (una fila por archivo de resultado)
+COLUMNAS = [
+    'tanda', 'tipo', 'dataset', 'solver', 'opciones', 'semilla', 'status', 'soluciones_encontradas',
+    'tiempo_primera_sol', 'tiempo_mejor_sol', 'tiempo_total', 'objetivo', 'timeout'
+]
+
+# Claves de una configuración: las semillas sólo se agregan dentro de una
+# misma tanda, dataset, solver y opciones de MiniZinc
+CLAVES_CONFIGURACION = ['tanda', 'tipo', 'dataset', 'solver', 'opciones']
+
+# Métricas resumidas entre semillas
+METRICAS_SEMILLAS = ['tiempo_primera_sol', 'tiempo_mejor_sol', 'objetivo']
+# Dispersión relativa bajo la cual las semillas se consideran sin efecto
+TOLERANCIA_SEMILLAS = 0.01
+# Remuestreos bootstrap y nivel de confianza de los intervalos de la mediana
+N_BOOTSTRAP = 2000
+CONFIANZA = 0.95
+
+
+def _numero(texto):
+    match = RE_NUMERO.search(texto)
+    return float(match.group(1)) if match else None
+
 
 def parse_result_file(file_path):
     """
-    Extrae información importante del archivo de resultados
-    """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Datos básicos
-    dataset_match = re.search(r'Dataset: (\S+)', content)
-    tiempo_total_match = re.search(r'Tiempo total ejecución: ([\d.]+) segundos', content)
-    soluciones_encontradas_match = re.search(r'Soluciones encontradas: (\d+)', content)
-    status_match = re.search(r'Status: (.+)', content)
-    
-    # Buscar tiempo de primera solución
-    primera_sol_match = re.search(r'Tiempo hasta primera solución: ([\d.]+) segundos', content)
-    
-    # Buscar en las estadísticas MiniZinc el tiempo de solve
-    solve_time_match = re.search(r'%%%mzn-stat: solveTime=([\d.]+)', content)
-    
-    # Buscar número de soluciones en estadísticas
-    solutions_stat_match = re.search(r'%%%mzn-stat: nSolutions=(\d+)', content)
-    
-    # Si no encontramos tiempo de primera solución pero hay solveTime, usamos ese
+    Extrae información importante del archivo de resultados.
+
+    Recorre el archivo una sola vez y se detiene en "SALIDA COMPLETA:":
+    el bloque de estadísticas del encabezado ya contiene los puntajes,
+    los tiempos de cada solución y las estadísticas finales del solver,
+    por lo que no es necesario leer las tablas de asignación. Sólo
+    nSolutions queda fuera del encabezado; se lee de los últimos bytes.
+    """
+    datos = {
+        'dataset': None,
+        'solver': None,
+        'opciones': '',
+        'semilla': None,
+        'tiempo_total': None,
+        'status': 'DESCONOCIDO',
+        'timeout': False,
+    }
+    soluciones_encabezado = None
+    primera_sol_encabezado = None
+    stats = {}
+    puntaje_pendiente = None
     tiempo_primera_sol = None
-    if primera_sol_match:
-        tiempo_primera_sol = float(primera_sol_match.group(1))
-    elif solve_time_match:
-        tiempo_primera_sol = float(solve_time_match.group(1))
-    
+    tiempo_mejor_sol = None
+    mejor_puntaje = None
+
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for linea in f:
+            if linea.startswith('SALIDA COMPLETA'):
+                break
+            linea = linea.strip()
+            if not linea or linea.startswith('% Pruned'):
+                continue
+
+            if linea.startswith('%'):
+                if linea.startswith('%%%mzn-stat:'):
+                    match = RE_STAT.match(linea)
+                    if match:
+                        stats[match.group(1)] = match.group(2)
+                elif puntaje_pendiente is not None:
+                    match = RE_ELAPSED.match(linea)
+                    if match:
+                        # Tiempo reportado por MiniZinc justo después de cada solución
+                        tiempo = float(match.group(1))
+                        if tiempo_primera_sol is None:
+                            tiempo_primera_sol = tiempo
+                        if mejor_puntaje is None or puntaje_pendiente > mejor_puntaje:
+                            mejor_puntaje = puntaje_pendiente
+                            tiempo_mejor_sol = tiempo
+                        puntaje_pendiente = None
+            elif linea.startswith('Puntaje total:'):
+                match = RE_PUNTAJE.match(linea)
+                if match:
+                    puntaje_pendiente = int(match.group(1))
+            elif linea.startswith('Dataset:'):
+                datos['dataset'] = linea.split(':', 1)[1].strip()
+            elif linea.startswith('Solver:'):
+                datos['solver'] = linea.split(':', 1)[1].strip()
+            elif linea.startswith('Opciones:'):
+                datos['opciones'] = linea.split(':', 1)[1].strip()
+            elif linea.startswith('Semilla:'):
+                datos['semilla'] = int(_numero(linea.split(':', 1)[1]))
+            elif linea.startswith('Tiempo total ejecución:') or linea.startswith('Tiempo ejecución:'):
+                datos['tiempo_total'] = _numero(linea.split(':', 1)[1])
+            elif linea.startswith('Tiempo hasta primera solución:'):
+                primera_sol_encabezado = _numero(linea.split(':', 1)[1])
+            elif linea.startswith('Soluciones encontradas:'):
+                soluciones_encabezado = int(_numero(linea.split(':', 1)[1]))
+            elif linea.startswith('Status:'):
+                datos['status'] = linea.split(':', 1)[1].strip()
+                datos['timeout'] = 'LÍMITE DE TIEMPO EXCEDIDO' in datos['status']
+
+    stats.update(_stats_cola(file_path))
+
+    # Tiempo de primera solución: el medido en la salida, si no el del encabezado
+    if tiempo_primera_sol is None:
+        tiempo_primera_sol = primera_sol_encabezado
+
     # Número de soluciones
-    if solutions_stat_match:
-        soluciones_encontradas = int(solutions_stat_match.group(1))
-    elif soluciones_encontradas_match:
-        soluciones_encontradas = int(soluciones_encontradas_match.group(1))
+    if 'nSolutions' in stats:
+        soluciones_encontradas = int(stats['nSolutions'])
+    elif soluciones_encabezado is not None:
+        soluciones_encontradas = soluciones_encabezado
     else:
         soluciones_encontradas = 0
-    
+
+    # Objetivo final reportado por el solver (-1 indica que no hubo solución)
+    objetivo = None
+    if 'objective' in stats and float(stats['objective']) >= 0:
+        objetivo = float(stats['objective'])
+    elif mejor_puntaje is not None:
+        objetivo = float(mejor_puntaje)
+
+    match = RE_RESULTADO.search(Path(file_path).stem)
     return {
-        'dataset': dataset_match.group(1) if dataset_match else os.path.basename(file_path),
-        'tiempo_total': float(tiempo_total_match.group(1)) if tiempo_total_match else None,
+        'tipo': match.group(1) if match else None,
+        'dataset': datos['dataset'] or os.path.basename(file_path),
+        'solver': datos['solver'],
+        'opciones': datos['opciones'],
+        'semilla': datos['semilla'],
+        'tiempo_total': datos['tiempo_total'],
         'tiempo_primera_sol': tiempo_primera_sol,
+        'tiempo_mejor_sol': tiempo_mejor_sol,
         'soluciones_encontradas': soluciones_encontradas,
-        'status': status_match.group(1) if status_match else 'DESCONOCIDO',
-        'timeout': 'LÍMITE DE TIEMPO EXCEDIDO' in content
+        'objetivo': objetivo,
+        'status': datos['status'],
+        'timeout': datos['timeout']
     }
 
-def generar_grafico_tipo(tipo_archivo, tipo_display, datos, output_dir):
+
+def _stats_cola(file_path):
+    """
+    Lee las estadísticas finales (%%%mzn-stat) del final del archivo sin
+    recorrerlo completo. Lee hacia atrás en bloques crecientes hasta que la
+    parte anterior a "[ERRORES]" contenga nSolutions o el inicio de
+    "SALIDA COMPLETA" (stderr puede ser más largo que un bloque).
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        tamaño = f.tell()
+        bloque = BYTES_COLA
+        while True:
+            inicio = max(0, tamaño - bloque)
+            f.seek(inicio)
+            cola = f.read().decode('utf-8', errors='replace')
+            salida = cola.split('[ERRORES]', 1)[0]
+            if 'SALIDA COMPLETA' in salida:
+                salida = salida.split('SALIDA COMPLETA', 1)[1]
+                break
+            if 'nSolutions=' in salida or inicio == 0:
+                break
+            bloque *= 2
+    return dict(RE_STAT.findall(salida))
+
+
+def parse_analisis_file(file_path):
+    """
+    Lee un archivo datosAnalisis_<tipo>.txt ya generado (por ejemplo una
+    tanda anterior guardada como snapshot) y devuelve una lista de registros
+    con las mismas claves que parse_result_file.
+    """
+    tipo = Path(file_path).stem.replace('datosAnalisis_', '', 1)
+    registros = []
+    actual = None
+
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for linea in f:
+            linea = linea.strip()
+            if linea.startswith('RESUMEN ESTADÍSTICO'):
+                break
+            if linea.startswith('Dataset:'):
+                actual = {
+                    'tipo': tipo,
+                    'dataset': linea.split(':', 1)[1].strip(),
+                    'solver': None,
+                    'opciones': '',
+                    'semilla': None,
+                    'tiempo_total': None,
+                    'tiempo_primera_sol': None,
+                    'tiempo_mejor_sol': None,
+                    'soluciones_encontradas': 0,
+                    'objetivo': None,
+                    'status': 'DESCONOCIDO',
+                    'timeout': False
+                }
+                registros.append(actual)
+            elif actual is None:
+                continue
+            elif linea.startswith('Solver:'):
+                actual['solver'] = linea.split(':', 1)[1].strip()
+            elif linea.startswith('Opciones:'):
+                actual['opciones'] = linea.split(':', 1)[1].strip()
+            elif linea.startswith('Semilla:'):
+                actual['semilla'] = int(_numero(linea.split(':', 1)[1]))
+            elif linea.startswith('Status:'):
+                actual['status'] = linea.split(':', 1)[1].strip()
+            elif linea.startswith('Soluciones encontradas:'):
+                actual['soluciones_encontradas'] = int(_numero(linea.split(':', 1)[1]))
+            elif linea.startswith('Tiempo primera solución:'):
+                actual['tiempo_primera_sol'] = _numero(linea.split(':', 1)[1])
+            elif linea.startswith('Tiempo mejor solución:'):
+                actual['tiempo_mejor_sol'] = _numero(linea.split(':', 1)[1])
+            elif linea.startswith('Objetivo:'):
+                actual['objetivo'] = _numero(linea.split(':', 1)[1])
+            elif linea.startswith('Tiempo total ejecución:'):
+                actual['tiempo_total'] = _numero(linea.split(':', 1)[1])
+            elif linea.startswith('Timeout:'):
+                actual['timeout'] = linea.split(':', 1)[1].strip() == 'SÍ'
+
+    # Los snapshots escritos por la versión anterior (sin líneas "Tiempo mejor
+    # solución:" ni "Objetivo:") usaban solveTime como "tiempo primera
+    # solución", haya o no soluciones; se descarta para que la métrica sea
+    # comparable con parse_result_file
+    formato_antiguo = not any(r['tiempo_mejor_sol'] is not None or r['objetivo'] is not None
+                              for r in registros)
+    for registro in registros:
+        if formato_antiguo or registro['soluciones_encontradas'] == 0:
+            registro['tiempo_primera_sol'] = None
+            registro['tiempo_mejor_sol'] = None
+
+    return registros
+
+
+def cargar_tanda(directorio, tanda=None):
     """
-    Genera gráfico de barras para un tipo específico
+    Carga en un DataFrame todos los resultados de una tanda (directorio).
+
+    Usa los archivos Resultado_*.txt si existen; si no, los snapshots
+    datosAnalisis_*.txt (como en datosAnalisisPrimeraTanda).
     """
-    # Filtrar datos válidos
-    datos_validos = [d for d in datos if d['tiempo_primera_sol'] is not None]
-    
-    if not datos_validos:
+    directorio = Path(directorio)
+    tanda = tanda or directorio.name
+    registros = []
+
+    archivos_resultados = sorted(directorio.glob("Resultado_*.txt"))
+    if archivos_resultados:
+        for archivo in archivos_resultados:
+            try:
+                registros.append(parse_result_file(archivo))
+            except Exception as e:
+                print(f"    ❌ Error parseando {archivo.name}: {e}")
+    else:
+        for archivo in sorted(directorio.glob("datosAnalisis_*.txt")):
+            try:
+                registros.extend(parse_analisis_file(archivo))
+            except Exception as e:
+                print(f"    ❌ Error parseando {archivo.name}: {e}")
+
+    df = pd.DataFrame(registros)
+    if df.empty:
+        return pd.DataFrame(columns=COLUMNAS)
+    df.insert(0, 'tanda', tanda)
+    return df[COLUMNAS]
+
+
+def cargar_tandas(directorios):
+    """
+    Concatena los resultados de varias tandas en un único DataFrame
+    """
+    tandas = [cargar_tanda(d) for d in directorios]
+    tandas = [df for df in tandas if not df.empty]
+    if not tandas:
+        return pd.DataFrame(columns=COLUMNAS)
+    return pd.concat(tandas, ignore_index=True)
+
+
+def _con_exito(df):
+    """
+    Agrega la columna 'exito' (1.0 si la ejecución encontró alguna solución)
+    y reemplaza solver/opciones faltantes (snapshots antiguos) por '' para
+    que no se descarten al agrupar
+    """
+    return df.assign(
+        exito=(pd.to_numeric(df['soluciones_encontradas'], errors='coerce') > 0).astype(float),
+        solver=df['solver'].fillna(''),
+        opciones=df['opciones'].fillna(''),
+    )
+
+
+def comparar_tandas(df, metricas=('tiempo_primera_sol', 'soluciones_encontradas', 'objetivo')):
+    """
+    Tabla lado a lado: una fila por (tipo, dataset) y una columna por
+    métrica, tanda, solver y opciones (mediana entre semillas si hay
+    varias). Solver y opciones van en las columnas para que tandas con
+    configuraciones distintas (o snapshots antiguos sin solver) queden en
+    la misma fila. Las medianas sólo consideran ejecuciones con valor, por
+    lo que cada columna lleva además su tasa_exito (fracción de ejecuciones
+    con solución).
+    """
+    df = _con_exito(df).rename(columns={'exito': 'tasa_exito'})
+    aggfunc = {metrica: 'median' for metrica in metricas}
+    aggfunc['tasa_exito'] = 'mean'
+    tabla = df.pivot_table(
+        index=['tipo', 'dataset'],
+        columns=['tanda', 'solver', 'opciones'],
+        values=list(aggfunc),
+        aggfunc=aggfunc
+    )
+    return tabla.sort_index()
+
+
+def intervalo_mediana(valores, confianza=CONFIANZA, n_bootstrap=N_BOOTSTRAP, semilla=0):
+    """
+    Intervalo de confianza bootstrap (percentil) para la mediana.
+    Con menos de dos valores el intervalo se reduce al propio valor.
+    """
+    valores = np.asarray(valores, dtype=float)
+    valores = valores[~np.isnan(valores)]
+    if len(valores) == 0:
+        return np.nan, np.nan
+    if len(valores) < 2:
+        return valores[0], valores[0]
+    rng = np.random.default_rng(semilla)
+    muestras = rng.choice(valores, size=(n_bootstrap, len(valores)), replace=True)
+    medianas = np.median(muestras, axis=1)
+    alfa = (1 - confianza) / 2
+    return np.quantile(medianas, alfa), np.quantile(medianas, 1 - alfa)
+
+
+def resumen_semillas(df, metricas=METRICAS_SEMILLAS):
+    """
+    Resume las ejecuciones de cada configuración (tanda, tipo, dataset,
+    solver, opciones) sobre sus semillas: n, mediana, Q1, Q3, IQR e
+    intervalo de confianza de la mediana por métrica. Las ejecuciones sin
+    valor (p. ej. sin solución) no cuentan para la métrica, por lo que la
+    mediana es condicional al éxito: debe leerse junto a tasa_exito
+    (n_exitos / n_ejecuciones).
+
+    semillas_sin_efecto marca las configuraciones con varias semillas en
+    que todas dieron el mismo objetivo y tiempos prácticamente iguales.
+    """
+    claves = CLAVES_CONFIGURACION
+    filas = []
+    for grupo, datos in _con_exito(df).groupby(claves, dropna=False, sort=False):
+        fila = dict(zip(claves, grupo))
+        fila['n_ejecuciones'] = len(datos)
+        fila['n_exitos'] = int(datos['exito'].sum())
+        fila['tasa_exito'] = fila['n_exitos'] / len(datos)
+        fila['semillas_sin_efecto'] = _semillas_sin_efecto(datos)
+        for metrica in metricas:
+            valores = pd.to_numeric(datos[metrica], errors='coerce').dropna().to_numpy()
+            fila[f'{metrica}_n'] = len(valores)
+            if len(valores):
+                q1, mediana, q3 = np.quantile(valores, [0.25, 0.5, 0.75])
+                ic_inf, ic_sup = intervalo_mediana(valores)
+            else:
+                q1 = mediana = q3 = ic_inf = ic_sup = np.nan
+            fila[f'{metrica}_mediana'] = mediana
+            fila[f'{metrica}_q1'] = q1
+            fila[f'{metrica}_q3'] = q3
+            fila[f'{metrica}_iqr'] = q3 - q1
+            fila[f'{metrica}_ic_inf'] = ic_inf
+            fila[f'{metrica}_ic_sup'] = ic_sup
+        filas.append(fila)
+    return pd.DataFrame(filas)
+
+
+def _semillas_sin_efecto(datos):
+    """
+    True si un grupo con dos o más semillas distintas dio el mismo objetivo
+    y tiempos de mejor solución dentro de TOLERANCIA_SEMILLAS (la semilla
+    no está cambiando la búsqueda)
+    """
+    if datos['semilla'].nunique() < 2:
+        return False
+    objetivos = pd.to_numeric(datos['objetivo'], errors='coerce')
+    tiempos = pd.to_numeric(datos['tiempo_mejor_sol'], errors='coerce')
+    if objetivos.nunique(dropna=False) > 1 or tiempos.isna().any():
+        return False
+    return (tiempos.max() - tiempos.min()) <= TOLERANCIA_SEMILLAS * max(tiempos.max(), 1.0)
+
+
+def _etiqueta_configuracion(solver, opciones):
+    return f"{solver or '?'} {opciones}".strip()
+
+
+def _numero_dataset(dataset):
+    match = re.search(r'(\d+)', dataset)
+    return int(match.group(1)) if match else 0
+
+
+def generar_grafico_tipo(tipo_archivo, tipo_display, datos, output_dir, dpi=300):
+    """
+    Genera gráfico de barras para un tipo específico. Con varias semillas
+    por dataset la barra es la mediana de las ejecuciones con solución y el
+    error marca el rango Q1-Q3; sobre cada barra se indica cuántas
+    ejecuciones encontraron solución (éxitos/total), de modo que un dataset
+    que rara vez se resuelve no aparezca como rápido.
+    """
+    df = _con_exito(pd.DataFrame(datos))
+    df['tiempo_primera_sol'] = pd.to_numeric(df['tiempo_primera_sol'], errors='coerce')
+
+    if not df['exito'].any():
         print(f"  ⚠️  No hay datos válidos para {tipo_display}")
         return
-    
+
+    # Una barra por dataset (y por solver/opciones si hay más de una configuración)
+    varias = len(df[['solver', 'opciones']].drop_duplicates()) > 1
+    claves = ['dataset', 'solver', 'opciones'] if varias else ['dataset']
+    grupos = df.groupby(claves)
+    resumen = grupos['tiempo_primera_sol'].quantile([0.25, 0.5, 0.75]).unstack()
+    resumen['exitos'] = grupos['exito'].sum()
+    resumen['ejecuciones'] = grupos.size()
+    resumen['soluciones'] = grupos['soluciones_encontradas'].median()
+
     # Ordenar por número de dataset
-    datos_validos.sort(key=lambda x: int(re.search(r'(\d+)', x['dataset']).group(1)))
-    
+    resumen = resumen.reset_index()
+    resumen = resumen.iloc[sorted(range(len(resumen)),
+                                  key=lambda i: (_numero_dataset(resumen['dataset'].iloc[i]), i))]
+
     # Preparar datos para el gráfico
-    datasets = [d['dataset'].replace('.dzn', '') for d in datos_validos]
-    tiempos = [d['tiempo_primera_sol'] for d in datos_validos]
-    soluciones = [d['soluciones_encontradas'] for d in datos_validos]
-    
+    datasets = [d.replace('.dzn', '') for d in resumen['dataset']]
+    if varias:
+        datasets = [f"{d}\n{_etiqueta_configuracion(s, o)}"
+                    for d, s, o in zip(datasets, resumen['solver'], resumen['opciones'])]
+    tiempos = resumen[0.5].fillna(0).tolist()
+    error = None
+    if (resumen['ejecuciones'] > 1).any():
+        error = [(resumen[0.5] - resumen[0.25]).fillna(0), (resumen[0.75] - resumen[0.5]).fillna(0)]
+    escala = float(resumen[0.75].max()) or 1
+
     # Crear gráfico
     fig, ax1 = plt.subplots(figsize=(12, 6))
-    
+
     # Barras de tiempo
-    bars = ax1.bar(datasets, tiempos, color='skyblue', alpha=0.7, label='Tiempo primera solución (s)')
+    bars = ax1.bar(datasets, tiempos, yerr=error, capsize=4, color='skyblue', alpha=0.7,
+                   label='Tiempo primera solución (s)')
     ax1.set_xlabel('Dataset')
     ax1.set_ylabel('Tiempo (segundos)', color='blue')
     ax1.tick_params(axis='y', labelcolor='blue')
-    ax1.set_title(f'Tiempo de Ejecución vs Dataset - {tipo_display.capitalize()}')
-    plt.xticks(rotation=45)
-    
+    ax1.set_title(f'Tiempo de Ejecución vs Dataset - {tipo_display.capitalize()}'
+                  + (' (mediana de las ejecuciones con solución)' if error is not None else ''))
+    ax1.tick_params(axis='x', rotation=45)
+    ax1.set_ylim(0, escala * 1.25)  # Espacio para las etiquetas sobre las barras
+
     # Añadir etiquetas con el tiempo en las barras
-    for bar, tiempo in zip(bars, tiempos):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + max(tiempos)*0.01,
-                f'{tiempo:.1f}s', ha='center', va='bottom', fontsize=9)
-    
-    # Añadir número de soluciones como texto arriba de las barras
-    for i, (bar, sol) in enumerate(zip(bars, soluciones)):
-        ax1.text(bar.get_x() + bar.get_width()/2., bar.get_height() + max(tiempos)*0.05,
-                f'{sol} sol', ha='center', va='bottom', fontsize=8, color='red', weight='bold')
-    
-    plt.tight_layout()
-    
+    for bar, tiempo, exitos in zip(bars, tiempos, resumen['exitos']):
+        ax1.text(bar.get_x() + bar.get_width()/2., bar.get_height() + escala*0.01,
+                f'{tiempo:.1f}s' if exitos else 'sin sol', ha='center', va='bottom', fontsize=9)
+
+    # Añadir éxitos/ejecuciones y número de soluciones arriba de las barras
+    for bar, exitos, n, sol in zip(bars, resumen['exitos'], resumen['ejecuciones'], resumen['soluciones']):
+        ax1.text(bar.get_x() + bar.get_width()/2., bar.get_height() + escala*0.05,
+                f'{exitos:.0f}/{n} ok\n{sol:g} sol', ha='center', va='bottom', fontsize=8,
+                color='red' if exitos < n else 'green', weight='bold')
+
+    fig.tight_layout()
+
     # Guardar gráfico
-    output_path = output_dir / f"grafico_tiempos_{tipo_archivo}.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
-    
+    output_path = Path(output_dir) / f"grafico_tiempos_{tipo_archivo}.png"
+    fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+
     print(f"  📊 Gráfico guardado: {output_path}")
+    return output_path
+
+
+def generar_grafico_comparacion(tipo_archivo, tipo_display, datos, output_dir, dpi=300):
+    """
+    Genera gráfico de barras agrupadas (una barra por tanda, o por tanda y
+    configuración si hay varias) con la mediana del tiempo de primera
+    solución de cada dataset de un tipo y, sobre cada barra, el porcentaje
+    de ejecuciones con solución
+    """
+    df = _con_exito(pd.DataFrame(datos))
+    df['tiempo_primera_sol'] = pd.to_numeric(df['tiempo_primera_sol'], errors='coerce')
+    if len(df[['solver', 'opciones']].drop_duplicates()) > 1:
+        df['serie'] = [f"{t} ({_etiqueta_configuracion(s, o)})"
+                       for t, s, o in zip(df['tanda'], df['solver'], df['opciones'])]
+    else:
+        df['serie'] = df['tanda']
+    tabla = df.pivot_table(index='dataset', columns='serie',
+                           values='tiempo_primera_sol', aggfunc='median')
+    if tabla.empty:
+        print(f"  ⚠️  No hay datos comparables para {tipo_display}")
+        return
+    tasas = df.pivot_table(index='dataset', columns='serie', values='exito', aggfunc='mean')
+    tabla = tabla.loc[sorted(tabla.index, key=_numero_dataset)]
+    tasas = tasas.reindex(index=tabla.index, columns=tabla.columns)
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    posiciones = np.arange(len(tabla.index))
+    ancho = 0.8 / len(tabla.columns)
+    for i, serie in enumerate(tabla.columns):
+        barras = ax.bar(posiciones + i * ancho, tabla[serie].fillna(0).to_numpy(), ancho, label=serie)
+        for barra, tasa in zip(barras, tasas[serie]):
+            if not np.isnan(tasa):
+                ax.text(barra.get_x() + barra.get_width()/2., barra.get_height(),
+                        f'{tasa:.0%}', ha='center', va='bottom', fontsize=7)
+
+    ax.set_xticks(posiciones + ancho * (len(tabla.columns) - 1) / 2)
+    ax.set_xticklabels([d.replace('.dzn', '') for d in tabla.index], rotation=45)
+    ax.set_xlabel('Dataset')
+    ax.set_ylabel('Tiempo primera solución (segundos, mediana con solución)')
+    ax.set_title(f'Comparación de tandas - {tipo_display.capitalize()} (% = ejecuciones con solución)')
+    ax.legend()
+    fig.tight_layout()
+
+    output_path = Path(output_dir) / f"grafico_comparacion_{tipo_archivo}.png"
+    fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+
+    print(f"  📊 Gráfico comparación guardado: {output_path}")
+    return output_path
+
 
 def crear_archivo_analisis(tipo_archivo, tipo_display, datos, output_dir):
     """
     Crea archivo de análisis conciso para cada tipo
     """
     # Ordenar por número de dataset
-    datos_ordenados = sorted(datos, key=lambda x: int(re.search(r'(\d+)', x['dataset']).group(1)))
-    
+    datos_ordenados = sorted(datos, key=lambda x: (_numero_dataset(x['dataset']), x.get('solver') or '',
+                                                   x.get('opciones') or '', x.get('semilla') or 0))
+
     # Preparar contenido
     contenido = f"ANÁLISIS DE DATOS - {tipo_display.upper()}\n"
     contenido += "=" * 50 + "\n\n"
-    
+
     for dato in datos_ordenados:
         contenido += f"Dataset: {dato['dataset']}\n"
+        if dato.get('solver'):
+            contenido += f"Solver: {dato['solver']}\n"
+        if dato.get('opciones'):
+            contenido += f"Opciones: {dato['opciones']}\n"
+        if dato.get('semilla') is not None:
+            contenido += f"Semilla: {dato['semilla']}\n"
         contenido += f"Status: {dato['status']}\n"
         contenido += f"Soluciones encontradas: {dato['soluciones_encontradas']}\n"
-        
+
         if dato['tiempo_primera_sol'] is not None:
             contenido += f"Tiempo primera solución: {dato['tiempo_primera_sol']:.2f} segundos\n"
         else:
             contenido += "Tiempo primera solución: NO ENCONTRADO\n"
-        
+
+        if dato.get('tiempo_mejor_sol') is not None:
+            contenido += f"Tiempo mejor solución: {dato['tiempo_mejor_sol']:.2f} segundos\n"
+
+        if dato.get('objetivo') is not None:
+            contenido += f"Objetivo: {dato['objetivo']:.0f}\n"
+
         if dato['tiempo_total'] is not None:
             contenido += f"Tiempo total ejecución: {dato['tiempo_total']:.2f} segundos\n"
-        
+
         contenido += f"Timeout: {'SÍ' if dato['timeout'] else 'NO'}\n"
         contenido += "-" * 30 + "\n"
-    
+
     # Añadir resumen estadístico
     tiempos_validos = [d['tiempo_primera_sol'] for d in datos_ordenados if d['tiempo_primera_sol'] is not None]
     soluciones_totales = sum([d['soluciones_encontradas'] for d in datos_ordenados])
+    exitos = sum([1 for d in datos_ordenados if d['soluciones_encontradas'] > 0])
     timeouts = sum([1 for d in datos_ordenados if d['timeout']])
-    
+
     contenido += "\nRESUMEN ESTADÍSTICO:\n"
-    contenido += f"Total datasets: {len(datos_ordenados)}\n"
+    contenido += f"Total datasets: {len({d['dataset'] for d in datos_ordenados})}\n"
+    contenido += f"Total ejecuciones: {len(datos_ordenados)}\n"
+    contenido += f"Ejecuciones con solución: {exitos}/{len(datos_ordenados)} ({exitos/len(datos_ordenados):.0%})\n"
     contenido += f"Total soluciones encontradas: {soluciones_totales}\n"
     contenido += f"Timeouts: {timeouts}\n"
-    
+
     if tiempos_validos:
-        contenido += f"Tiempo promedio primera solución: {sum(tiempos_validos)/len(tiempos_validos):.2f} segundos\n"
+        contenido += ("Tiempo promedio primera solución (ejecuciones con solución): "
+                      f"{sum(tiempos_validos)/len(tiempos_validos):.2f} segundos\n")
         contenido += f"Tiempo máximo: {max(tiempos_validos):.2f} segundos\n"
         contenido += f"Tiempo mínimo: {min(tiempos_validos):.2f} segundos\n"
-    
+
+    # Resumen entre semillas (sólo si alguna configuración se ejecutó más de una vez)
+    configuraciones = {(d['dataset'], d.get('solver'), d.get('opciones')) for d in datos_ordenados}
+    if len(configuraciones) < len(datos_ordenados):
+        resumen = resumen_semillas(pd.DataFrame(datos_ordenados))
+        contenido += (f"\nRESUMEN ENTRE SEMILLAS (mediana [Q1-Q3], IC {CONFIANZA:.0%} de la mediana, "
+                      "sobre las ejecuciones con solución):\n")
+        for fila in sorted(resumen.to_dict('records'),
+                           key=lambda x: (_numero_dataset(x['dataset']), x['solver'], x['opciones'])):
+            contenido += (f"Dataset: {fila['dataset']} [{_etiqueta_configuracion(fila['solver'], fila['opciones'])}] "
+                          f"({fila['n_ejecuciones']} ejecuciones, con solución "
+                          f"{fila['n_exitos']}/{fila['n_ejecuciones']} = {fila['tasa_exito']:.0%})\n")
+            if fila['semillas_sin_efecto']:
+                contenido += "  ⚠️  Todas las semillas dieron el mismo objetivo y tiempo: la semilla no cambia la búsqueda\n"
+            for metrica in METRICAS_SEMILLAS:
+                if fila[f'{metrica}_n']:
+                    contenido += (f"  {metrica}: {fila[f'{metrica}_mediana']:.2f} "
+                                  f"[{fila[f'{metrica}_q1']:.2f}-{fila[f'{metrica}_q3']:.2f}] "
+                                  f"IC ({fila[f'{metrica}_ic_inf']:.2f}, {fila[f'{metrica}_ic_sup']:.2f}) "
+                                  f"n={fila[f'{metrica}_n']}/{fila['n_ejecuciones']}\n")
+                else:
+                    contenido += f"  {metrica}: SIN DATOS (0/{fila['n_ejecuciones']})\n"
+
     # Guardar archivo
-    output_path = output_dir / f"datosAnalisis_{tipo_archivo}.txt"
+    output_path = Path(output_dir) / f"datosAnalisis_{tipo_archivo}.txt"
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(contenido)
-    
+
     print(f"  📄 Archivo análisis guardado: {output_path}")
 
+
+def _registros(df):
+    """Convierte un DataFrame en registros con None en vez de NaN"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Análisis y gráficos de resultados MiniZinc')
+    parser.add_argument('--resultados', type=str, default='Resultadosminizinc',
+                        help='Directorio de la tanda a analizar')
+    parser.add_argument('--analisis', type=str, default='datosAnalisis',
+                        help='Directorio de salida del análisis')
+    parser.add_argument('--comparar', type=str, nargs='*', default=[],
+                        help='Otras tandas (directorios) a comparar con la actual')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Procesos para generar gráficos (por defecto: núcleos disponibles)')
+    parser.add_argument('--dpi', type=int, default=300, help='Resolución de los PNG')
+    args = parser.parse_args()
+
     # Configuración de rutas
     BASE_DIR = Path(".").resolve()
-    RESULTADOS_DIR = BASE_DIR / "Resultadosminizinc"
-    ANALISIS_DIR = BASE_DIR / "datosAnalisis"
-    
+    RESULTADOS_DIR = BASE_DIR / args.resultados
+    ANALISIS_DIR = BASE_DIR / args.analisis
+
     # Crear directorio de análisis si no existe
     ANALISIS_DIR.mkdir(exist_ok=True)
-    
+
     print("📈 Iniciando análisis de resultados...")
     print(f"📁 Resultados: {RESULTADOS_DIR}")
     print(f"📊 Análisis: {ANALISIS_DIR}")
     print("-" * 50)
-    
+
     # Mapeo de nombres de archivo a nombres de display
     # Basado en los nombres reales que me proporcionaste
     TIPOS_CONFIG = {
         "pequeñao": "pequeñas",
-        "medianao": "medianas", 
+        "medianao": "medianas",
         "grandes": "grandes"
     }
-    
-    # Procesar cada tipo
-    for tipo_archivo, tipo_display in TIPOS_CONFIG.items():
-        print(f"\n🔍 Analizando tipo: {tipo_display} (archivos: {tipo_archivo}_*.txt)")
-        
-        # Buscar archivos de resultados para este tipo
-        pattern = f"Resultado_{tipo_archivo}_*.txt"
-        archivos_resultados = list(RESULTADOS_DIR.glob(pattern))
-        
-        if not archivos_resultados:
-            print(f"  ⚠️  No se encontraron archivos para patrón: {pattern}")
-            # Listar archivos disponibles para debugging
-            todos_archivos = list(RESULTADOS_DIR.glob("Resultado_*.txt"))
-            if todos_archivos:
-                print(f"  📂 Archivos disponibles: {[f.name for f in todos_archivos]}")
-            continue
-        
-        print(f"  📁 Encontrados {len(archivos_resultados)} archivos")
-        
-        # Parsear todos los archivos
-        datos_tipo = []
-        for archivo in archivos_resultados:
-            try:
-                datos = parse_result_file(archivo)
-                datos_tipo.append(datos)
-                print(f"    ✅ {archivo.name} - {datos['soluciones_encontradas']} soluciones - {datos['tiempo_primera_sol'] or 'N/A'}s")
-            except Exception as e:
-                print(f"    ❌ Error parseando {archivo.name}: {e}")
-        
-        # Generar gráfico
-        generar_grafico_tipo(tipo_archivo, tipo_display, datos_tipo, ANALISIS_DIR)
-        
-        # Crear archivo de análisis
-        crear_archivo_analisis(tipo_archivo, tipo_display, datos_tipo, ANALISIS_DIR)
-    
+
+    df = cargar_tanda(RESULTADOS_DIR)
+    if df.empty:
+        print(f"  ⚠️  No se encontraron resultados en: {RESULTADOS_DIR}")
+        return
+    print(f"  📁 Encontrados {len(df)} archivos")
+    df.to_csv(ANALISIS_DIR / "resultados.csv", index=False)
+    resumen = resumen_semillas(df)
+    resumen.to_csv(ANALISIS_DIR / "resumen_semillas.csv", index=False)
+    sin_efecto = resumen[resumen['semillas_sin_efecto']]
+    if not sin_efecto.empty:
+        print(f"  ⚠️  En {len(sin_efecto)} configuración(es) todas las semillas dieron el mismo "
+              "objetivo y tiempo: la semilla no cambia la búsqueda (usar búsqueda libre -f o reinicios)")
+
+    # Los gráficos se generan en paralelo; los archivos de análisis son baratos
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        tareas = []
+        for tipo_archivo, tipo_display in TIPOS_CONFIG.items():
+            datos_tipo = _registros(df[df['tipo'] == tipo_archivo])
+            if not datos_tipo:
+                print(f"  ⚠️  No se encontraron archivos para tipo: {tipo_archivo}")
+                continue
+            print(f"\n🔍 Analizando tipo: {tipo_display} ({len(datos_tipo)} archivos)")
+            for datos in datos_tipo:
+                print(f"    ✅ {datos['dataset']} - {datos['soluciones_encontradas']} soluciones - {datos['tiempo_primera_sol'] or 'N/A'}s")
+
+            # Generar gráfico
+            tareas.append(pool.submit(generar_grafico_tipo, tipo_archivo, tipo_display,
+                                      datos_tipo, ANALISIS_DIR, args.dpi))
+
+            # Crear archivo de análisis
+            crear_archivo_analisis(tipo_archivo, tipo_display, datos_tipo, ANALISIS_DIR)
+
+        # Comparación con otras tandas
+        if args.comparar:
+            df_todas = pd.concat([df, cargar_tandas(BASE_DIR / d for d in args.comparar)],
+                                 ignore_index=True)
+            comparar_tandas(df_todas).to_csv(ANALISIS_DIR / "comparacion_tandas.csv")
+            print(f"\n  📄 Comparación guardada: {ANALISIS_DIR / 'comparacion_tandas.csv'}")
+            for tipo_archivo, tipo_display in TIPOS_CONFIG.items():
+                datos_tipo = _registros(df_todas[df_todas['tipo'] == tipo_archivo])
+                if datos_tipo:
+                    tareas.append(pool.submit(generar_grafico_comparacion, tipo_archivo,
+                                              tipo_display, datos_tipo, ANALISIS_DIR, args.dpi))
+
+        for tarea in tareas:
+            tarea.result()
+
     print("\n" + "=" * 50)
     print("🎉 Análisis completado!")
     print(f"📈 Gráficos guardados en: {ANALISIS_DIR}")
     print(f"📄 Archivos de análisis guardados en: {ANALISIS_DIR}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,50 +1,147 @@
 import json
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')  # Render sin ventana: escribe archivos en lote
 import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap
+from matplotlib.patches import Patch
 import numpy as np
-import os
+
+from catalogo import Catalogo
+from solucion import arrays_instancia, cargar_solucion, dataset_resultado
+
+# Sobre este número de celdas no se escribe el puntaje en cada celda
+LIMITE_ANOTACIONES = 2500
+# Sobre este número de trabajadores (o días) no se rotula cada fila (o columna)
+LIMITE_ETIQUETAS = 60
+# Tamaño máximo de figura (pulgadas) para instancias muy grandes
+MAX_ANCHO, MAX_ALTO = 24, 40
 
 def cargar_solucion_json(ruta_json):
     with open(ruta_json, 'r', encoding='utf-8') as f:
         datos = json.load(f)
     return datos
 
-def graficar_calendario(datos, asignacion=None):
-    trabajadores = list(datos['trabajadores'].values())
-    dias = datos['metadata']['horizonte_dias']
+def matriz_turnos(x):
+    """
+    Codifica la asignación x (P, D, T) como un código por celda (P, D):
+    bit t encendido si la persona trabaja el turno t ese día.
+    """
+    pesos = 1 << np.arange(x.shape[-1])
+    return (x.astype(np.int64) * pesos).sum(axis=-1)
+
+def _etiqueta_codigo(codigo, turnos):
+    letras = ''.join(t.upper() for i, t in enumerate(turnos) if codigo >> i & 1)
+    return letras or 'Libre'
+
+def graficar_calendario(datos, asignacion, ruta_salida, puntajes=None, dpi=150):
+    """
+    Dibuja la asignación como imagen (filas = trabajadores, columnas = días)
+    con un color por combinación de turnos y, si la instancia es pequeña,
+    el puntaje obtenido en cada celda. Guarda la figura en ruta_salida
+    (PNG o SVG según la extensión).
+    """
     turnos = datos['metadata']['turnos']
-    n_trabajadores = datos['metadata']['num_trabajadores']
-    fig, ax = plt.subplots(figsize=(dias+2, n_trabajadores/2+2))
-    tabla = []
-    encabezado = ['Día'] + trabajadores
-    for d in range(1, dias+1):
-        fila = [f"{d}"]
-        for p in range(1, n_trabajadores+1):
-            celda = ""
-            if asignacion:
-                for t_idx, t in enumerate(turnos):
-                    clave = f"x_{p}_{d}_{t}"
-                    if asignacion.get(clave, 0) == 1:
-                        celda += t.upper()[0] + " "
-            fila.append(celda.strip())
-        tabla.append(fila)
-    # Mostrar tabla
-    ax.axis('off')
-    tabla_plot = ax.table(cellText=tabla, colLabels=encabezado, loc='center', cellLoc='center')
-    tabla_plot.auto_set_font_size(False)
-    tabla_plot.set_fontsize(10)
-    tabla_plot.scale(1.2, 1.2)
-    plt.title('Asignación de turnos (calendario)')
-    plt.tight_layout()
-    plt.show()
+    n_trabajadores, dias, n_turnos = asignacion.shape
+    if puntajes is None:
+        _, puntajes = arrays_instancia(datos)
+
+    codigos = matriz_turnos(asignacion)
+    score = (puntajes * asignacion).sum(axis=-1)
+
+    n_codigos = 1 << n_turnos
+    colores = ['white'] + [plt.cm.tab10(i) for i in range(n_codigos - 1)]
+    cmap = ListedColormap(colores)
+
+    ancho = min(MAX_ANCHO, 2 + dias * 0.5)
+    alto = min(MAX_ALTO, 2 + n_trabajadores * 0.3)
+    fig, ax = plt.subplots(figsize=(ancho, alto))
+    ax.imshow(codigos, cmap=cmap, vmin=-0.5, vmax=n_codigos - 0.5,
+              aspect='auto', interpolation='nearest')
+
+    # Puntaje por celda sólo donde hay turno y cuando sigue siendo legible
+    if codigos.size <= LIMITE_ANOTACIONES:
+        filas, columnas = np.nonzero(codigos)
+        for p, d in zip(filas, columnas):
+            ax.text(d, p, str(score[p, d]), ha='center', va='center', fontsize=7)
+
+    ax.set_xlabel('Día')
+    ax.set_ylabel('Trabajador')
+    if dias <= LIMITE_ETIQUETAS:
+        ax.set_xticks(np.arange(dias))
+        ax.set_xticklabels(np.arange(1, dias + 1))
+    if n_trabajadores <= LIMITE_ETIQUETAS:
+        ax.set_yticks(np.arange(n_trabajadores))
+        ax.set_yticklabels([f"P{p}" for p in range(1, n_trabajadores + 1)])
+
+    presentes = np.unique(codigos)
+    ax.legend(handles=[Patch(facecolor=colores[c], edgecolor='gray',
+                             label=_etiqueta_codigo(c, turnos)) for c in presentes],
+              loc='upper left', bbox_to_anchor=(1.01, 1), title='Turnos')
+    ax.set_title(f"Asignación de turnos (calendario) - puntaje total {score.sum()}")
+    fig.tight_layout()
+    fig.savefig(ruta_salida, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return ruta_salida
+
+def graficar_desde_archivos(ruta_instancia, ruta_resultado, ruta_salida, dpi=150):
+    """
+    Carga instancia y solución desde disco y escribe el calendario.
+    Pensada para ejecutarse en un proceso trabajador.
+    """
+    solucion = cargar_solucion(ruta_resultado)
+    if solucion is None:
+        return None
+    datos = cargar_solucion_json(ruta_instancia)
+    return graficar_calendario(datos, solucion['x'], ruta_salida, dpi=dpi)
+
+def graficar_lote(trabajos, workers=None, dpi=150):
+    """
+    Genera en paralelo los calendarios de una lista de trabajos
+    (ruta_instancia, ruta_resultado, ruta_salida).
+    """
+    generados = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tareas = {pool.submit(graficar_desde_archivos, *trabajo, dpi): trabajo for trabajo in trabajos}
+        for tarea, trabajo in tareas.items():
+            ruta = tarea.result()
+            if ruta is None:
+                print(f"  ⚠️  Sin solución completa en: {trabajo[1]}")
+            else:
+                print(f"  📅 Calendario guardado: {ruta}")
+                generados.append(ruta)
+    return generados
 
 if __name__ == "__main__":
-    # Graficar todas las instancias generadas en 'instancias/'
-    directorio = 'instancias'
-    archivos = [f for f in os.listdir(directorio) if f.endswith('.json')]
-    if not archivos:
-        print(f"No se encontraron archivos .json en {directorio}")
-    for archivo in archivos:
-        ruta_json = os.path.join(directorio, archivo)
-        print(f"Mostrando calendario para: {archivo}")
-        datos = cargar_solucion_json(ruta_json)
-        graficar_calendario(datos)
+    parser = argparse.ArgumentParser(description='Calendarios de asignación a partir de resultados MiniZinc')
+    parser.add_argument('--resultados', type=str, default='Resultadosminizinc', help='Directorio de resultados')
+    parser.add_argument('--instancias', type=str, default='instancias', help='Directorio de instancias (con catalogo.json)')
+    parser.add_argument('--salida', type=str, default='calendarios', help='Directorio de salida')
+    parser.add_argument('--formato', type=str, default='png', choices=['png', 'svg'], help='Formato de imagen')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos en paralelo')
+    parser.add_argument('--dpi', type=int, default=150, help='Resolución de los PNG')
+    args = parser.parse_args()
+
+    os.makedirs(args.salida, exist_ok=True)
+    catalogo = Catalogo.cargar(args.instancias)
+    trabajos = []
+    for ruta_resultado in sorted(Path(args.resultados).glob('Resultado_*.txt')):
+        dataset = dataset_resultado(ruta_resultado)
+        if dataset is None:
+            continue
+        instancia = catalogo.por_nombre(dataset)
+        if instancia is None:
+            print(f"La instancia {dataset} no está en el catálogo")
+            continue
+        ruta_instancia = instancia.ruta_json
+        ruta_salida = Path(args.salida) / f"calendario_{ruta_resultado.stem}.{args.formato}"
+        trabajos.append((str(ruta_instancia), str(ruta_resultado), str(ruta_salida)))
+
+    if not trabajos:
+        print(f"No se encontraron resultados en {args.resultados}")
+    else:
+        graficar_lote(trabajos, args.workers, args.dpi)
@@ -0,0 +1,209 @@
+"""
+Carga de instancias y soluciones como arreglos NumPy.
+
+Convenciones de índices (0-based, igual orden que el modelo MiniZinc):
+    demanda[d, t]      -> demanda del día d+1, turno t+1
+    puntajes[p, d, t]  -> disposición de la persona p+1 en el día d+1, turno t+1
+    x[p, d, t]         -> 1 si la persona p+1 trabaja el día d+1 en el turno t+1
+    y[p, w]            -> 1 si la persona p+1 trabaja el fin de semana w+1
+"""
+
+import json
+import re
+
+import numpy as np
+
+# Fila de la tabla de asignación del modelo: " 3 | D· ( 4) | ·N (10) | T1:2 T2:1"
+RE_FILA_TABLA = re.compile(r'^\s*(\d+) \| (.*) \| T\d+:')
+SIN_TURNO = '·'
+# Encabezado de cada tabla y objetivo final reportado por el solver
+RE_PUNTAJE = re.compile(r'Puntaje total: (\d+)')
+RE_OBJETIVO = re.compile(r'%%%mzn-stat: objective=(-?[\d.]+)')
+# Línea de solución emitida por la sección "json" del modelo
+PREFIJO_JSON = '{"objetivo"'
+RE_ELAPSED = re.compile(r'% time elapsed: ([\d.]+) s')
+
+# Campos de la salida JSON y su tipo NumPy
+CAMPOS_JSON = {
+    'x': np.int8,
+    'y': np.int8,
+    'turnos_persona': np.int64,
+    'findes_persona': np.int64,
+    'score_persona': np.int64,
+}
+
+
+def arrays_instancia(datos):
+    """
+    Convierte una instancia JSON del generador en arreglos NumPy
+    (demanda de forma (D, T) y puntajes de forma (P, D, T)).
+    """
+    meta = datos['metadata']
+    turnos = meta['turnos']
+    P = meta['num_trabajadores']
+    D = meta['horizonte_dias']
+
+    demanda = np.array(
+        [[datos['demanda'][f"dia_{d}_turno_{t}"] for t in turnos]
+         for d in range(1, D + 1)],
+        dtype=np.int64
+    )
+    disposicion = datos['puntajes_disposicion']
+    puntajes = np.array(
+        [disposicion[f"trabajador_{p}_dia_{d}_turno_{t}"]
+         for p in range(1, P + 1)
+         for d in range(1, D + 1)
+         for t in turnos],
+        dtype=np.int64
+    ).reshape(P, D, len(turnos))
+    return demanda, puntajes
+
+
+def dataset_resultado(ruta_resultado):
+    """Lee el nombre del dataset (.dzn) desde el encabezado de un Resultado_*.txt"""
+    with open(ruta_resultado, 'r', encoding='utf-8', errors='replace') as f:
+        for linea in f:
+            if linea.startswith('Dataset:'):
+                return linea.split(':', 1)[1].strip()
+    return None
+
+
+def _tabla_a_array(filas):
+    """Convierte las filas de una tabla de asignación en x de forma (P, D, T)"""
+    celdas = [fila.split(' | ') for fila in filas]
+    marcas = [[celda.split(' (', 1)[0].strip() for celda in dia] for dia in celdas]
+    # marcas[d][p][t] -> x[p, d, t]
+    planos = np.array([[list(celda) for celda in dia] for dia in marcas])
+    return (planos != SIN_TURNO).astype(np.int8).transpose(1, 0, 2)
+
+
+def cargar_solucion_texto(ruta):
+    """
+    Lee la última solución completa de un archivo Resultado_*.txt
+    (salida en formato tabla del modelo).
+
+    Devuelve un diccionario con x de forma (P, D, T) y el objetivo
+    reportado ("Puntaje total" de esa tabla o, si falta, la estadística
+    objective del solver), o None si el archivo no contiene ninguna
+    solución completa.
+    """
+    ultima = None
+    filas = []
+    puntaje = None
+    puntaje_ultima = None
+    objetivo_solver = None
+    en_salida = False
+
+    with open(ruta, 'r', encoding='utf-8', errors='replace') as f:
+        for linea in f:
+            if not en_salida:
+                en_salida = linea.startswith('SALIDA COMPLETA')
+                continue
+            if linea.startswith('[ERRORES]'):
+                break
+            match = RE_FILA_TABLA.match(linea)
+            if match:
+                filas.append(match.group(2))
+            elif linea.startswith('Demanda total:'):
+                # Fin de una solución: la tabla leída está completa
+                if filas:
+                    ultima = filas
+                    puntaje_ultima = puntaje
+                filas = []
+            elif linea.startswith('ASIGNACIÓN'):
+                filas = []
+                puntaje = None
+            elif linea.startswith('Puntaje total:'):
+                match = RE_PUNTAJE.match(linea)
+                puntaje = int(match.group(1)) if match else None
+            elif linea.startswith('%%%mzn-stat: objective='):
+                match = RE_OBJETIVO.match(linea)
+                if match and float(match.group(1)) >= 0:
+                    objetivo_solver = int(float(match.group(1)))
+
+    if ultima is None:
+        return None
+    objetivo = puntaje_ultima if puntaje_ultima is not None else objetivo_solver
+    return {'objetivo': objetivo, 'tiempo': None, 'x': _tabla_a_array(ultima)}
+
+
+def _solucion_desde_json(linea):
+    """Convierte una línea JSON del modelo en un diccionario de arreglos"""
+    datos = json.loads(linea)
+    solucion = {'objetivo': int(datos['objetivo']), 'tiempo': None}
+    for campo, dtype in CAMPOS_JSON.items():
+        if campo in datos:
+            solucion[campo] = np.asarray(datos[campo], dtype=dtype)
+    return solucion
+
+
+def iterar_soluciones_json(ruta):
+    """
+    Recorre un archivo Resultado_*.txt generado en modo JSON y entrega
+    cada solución (en el orden en que el solver las encontró) con su
+    tiempo de hallazgo en 'tiempo' cuando está disponible.
+    """
+    pendiente = None
+    en_salida = False
+
+    with open(ruta, 'r', encoding='utf-8', errors='replace') as f:
+        for linea in f:
+            if not en_salida:
+                en_salida = linea.startswith('SALIDA COMPLETA')
+                continue
+            if linea.startswith('[ERRORES]'):
+                break
+            if linea.startswith(PREFIJO_JSON):
+                if pendiente is not None:
+                    yield pendiente
+                try:
+                    pendiente = _solucion_desde_json(linea)
+                except ValueError:
+                    # Línea truncada por el límite de tiempo
+                    pendiente = None
+            elif pendiente is not None:
+                match = RE_ELAPSED.match(linea)
+                if match:
+                    pendiente['tiempo'] = float(match.group(1))
+                    yield pendiente
+                    pendiente = None
+
+    if pendiente is not None:
+        yield pendiente
+
+
+def cargar_solucion(ruta):
+    """
+    Carga la última solución de un archivo de resultados, ya sea en modo
+    JSON o en formato tabla. Devuelve un diccionario con al menos 'x',
+    o None si no hay ninguna solución completa.
+    """
+    ruta = str(ruta)
+    if ruta.endswith('.npz'):
+        return cargar_solucion_npz(ruta)
+
+    ultima = None
+    for ultima in iterar_soluciones_json(ruta):
+        pass
+    if ultima is not None:
+        return ultima
+
+    return cargar_solucion_texto(ruta)
+
+
+def guardar_solucion_npz(ruta, solucion):
+    """Guarda una solución (diccionario de arreglos) en formato .npz comprimido"""
+    arreglos = {k: np.asarray(v) for k, v in solucion.items() if v is not None}
+    np.savez_compressed(ruta, **arreglos)
+
+
+def cargar_solucion_npz(ruta):
+    """Carga una solución guardada con guardar_solucion_npz"""
+    with np.load(ruta) as datos:
+        solucion = {k: datos[k] for k in datos.files}
+    for campo in ('objetivo', 'tiempo'):
+        if campo in solucion:
+            solucion[campo] = solucion[campo].item()
+        else:
+            solucion[campo] = None
+    return solucion
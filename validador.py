@@ -0,0 +1,180 @@
+"""
+Validador independiente de soluciones.
+
+Verifica una asignación x contra los arreglos de su instancia, sin usar la
+salida del solver, y recalcula la función objetivo. Todas las funciones
+aceptan x de forma (P, D, T) o un lote de candidatos de forma (N, P, D, T):
+los arreglos de la instancia se difunden (broadcasting) sobre el lote.
+
+Restricciones verificadas (las mismas de modelo.mzn):
+    cobertura       sum_p x[p,d,t] = demanda[d,t]
+    puntaje_cero    puntajes[p,d,t] = 0 -> x[p,d,t] = 0
+    max_turnos_dia  sum_t x[p,d,t] <= 2
+    noche_manana    x[p,d,ultimo] + x[p,d+1,primero] <= 1   (sólo con 3 turnos)
+    tres_findes     y[p,w] + y[p,w+1] + y[p,w+2] <= 2
+    y_consistente   y[p,w] = 1 sii p trabaja sábado o domingo de la semana w
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from catalogo import Catalogo
+from solucion import cargar_solucion, dataset_resultado, iterar_soluciones_json
+
+MAX_TURNOS_DIA = 2
+MAX_FINDES_SEGUIDOS = 2
+
+
+def findes_trabajados(x, num_semanas=None):
+    """
+    Calcula y (…, P, S): 1 si la persona trabaja algún turno el sábado
+    (día 7w-1) o el domingo (día 7w) de la semana w.
+    """
+    dias = x.shape[-2]
+    num_semanas = num_semanas or -(-dias // 7)
+    trabaja = x.any(axis=-1)
+    relleno = [(0, 0)] * (trabaja.ndim - 1) + [(0, 7 * num_semanas - dias)]
+    semanas = np.pad(trabaja, relleno).reshape(*trabaja.shape[:-1], num_semanas, 7)
+    return semanas[..., 5:].any(axis=-1).astype(np.int8)
+
+
+def objetivo(x, puntajes):
+    """Recalcula sum_{p,d,t} puntajes[p,d,t] * x[p,d,t] (uno por candidato)"""
+    return (x.astype(np.int64) * puntajes).sum(axis=(-3, -2, -1))
+
+
+def violaciones(x, puntajes, demanda, num_semanas=None, y=None):
+    """
+    Devuelve un diccionario restricción -> máscara booleana con True en
+    cada posición que viola la restricción. Las formas son (sin el lote):
+        cobertura (D, T), puntaje_cero (P, D, T), max_turnos_dia (P, D),
+        noche_manana (P, D-1), tres_findes (P, S-2), y_consistente (P, S)
+    """
+    x = np.asarray(x)
+    turnos_dia = x.sum(axis=-1)
+    findes = findes_trabajados(x, num_semanas)
+
+    resultado = {
+        'cobertura': x.sum(axis=-3) != demanda,
+        'puntaje_cero': (x != 0) & (puntajes == 0),
+        'max_turnos_dia': turnos_dia > MAX_TURNOS_DIA,
+    }
+
+    if x.shape[-1] >= 3:
+        resultado['noche_manana'] = (x[..., :-1, -1] + x[..., 1:, 0]) > 1
+    else:
+        resultado['noche_manana'] = np.zeros(x.shape[:-2] + (max(x.shape[-2] - 1, 0),), dtype=bool)
+
+    # Ventanas de tres semanas consecutivas
+    resultado['tres_findes'] = (
+        findes[..., :-2] + findes[..., 1:-1] + findes[..., 2:]
+    ) > MAX_FINDES_SEGUIDOS
+
+    if y is not None:
+        resultado['y_consistente'] = np.asarray(y) != findes
+
+    return resultado
+
+
+def contar_violaciones(mascaras, lote=False):
+    """
+    Cuenta violaciones por restricción. Con lote=True devuelve un arreglo
+    por restricción (una cuenta por candidato).
+    """
+    conteos = {}
+    for nombre, mascara in mascaras.items():
+        if lote:
+            conteos[nombre] = mascara.reshape(mascara.shape[0], -1).sum(axis=1)
+        else:
+            conteos[nombre] = int(mascara.sum())
+    return conteos
+
+
+def factibles(x, puntajes, demanda, num_semanas=None):
+    """Máscara (N,) con los candidatos de un lote que cumplen todas las restricciones"""
+    mascaras = violaciones(x, puntajes, demanda, num_semanas)
+    ok = np.ones(np.asarray(x).shape[0], dtype=bool)
+    for mascara in mascaras.values():
+        ok &= ~mascara.reshape(mascara.shape[0], -1).any(axis=1)
+    return ok
+
+
+def validar_solucion(solucion, puntajes, demanda, num_semanas=None):
+    """
+    Valida una solución (diccionario con 'x' y opcionalmente 'y' y
+    'objetivo', como los de solucion.py).
+
+    Devuelve un diccionario con el objetivo recalculado, las cuentas de
+    violaciones, sus ubicaciones (índices 0-based de cada máscara) y si el
+    objetivo reportado por el solver coincide con el recalculado.
+    """
+    x = solucion['x']
+    mascaras = violaciones(x, puntajes, demanda, num_semanas, solucion.get('y'))
+    conteos = contar_violaciones(mascaras)
+    recalculado = int(objetivo(x, puntajes))
+    reportado = solucion.get('objetivo')
+
+    return {
+        'factible': not any(conteos.values()),
+        'objetivo': recalculado,
+        'objetivo_reportado': reportado,
+        'objetivo_coincide': reportado is None or int(reportado) == recalculado,
+        'violaciones': conteos,
+        'ubicaciones': {nombre: np.argwhere(mascara)
+                        for nombre, mascara in mascaras.items() if conteos[nombre]},
+    }
+
+
+def _imprimir_validacion(etiqueta, validacion):
+    estado = '✅' if validacion['factible'] and validacion['objetivo_coincide'] else '❌'
+    print(f"  {estado} {etiqueta} - objetivo {validacion['objetivo']}"
+          + (f" (reportado {validacion['objetivo_reportado']})"
+             if validacion['objetivo_reportado'] is not None else ""))
+    for nombre, ubicaciones in validacion['ubicaciones'].items():
+        # Índices 1-based como en el modelo
+        ejemplos = ', '.join(str(tuple(int(i) + 1 for i in u)) for u in ubicaciones[:5])
+        print(f"      {nombre}: {validacion['violaciones'][nombre]} violaciones, p.ej. {ejemplos}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validación independiente de soluciones MiniZinc')
+    parser.add_argument('--resultados', type=str, default='Resultadosminizinc', help='Directorio de resultados')
+    parser.add_argument('--instancias', type=str, default='instancias', help='Directorio de instancias (con catalogo.json)')
+    parser.add_argument('--todas', action='store_true',
+                        help='Validar todas las soluciones intermedias (salida JSON), no sólo la última')
+    args = parser.parse_args()
+
+    catalogo = Catalogo.cargar(args.instancias)
+    invalidas = 0
+    for ruta_resultado in sorted(Path(args.resultados).glob('Resultado_*.txt')):
+        dataset = dataset_resultado(ruta_resultado)
+        if dataset is None:
+            continue
+        instancia = catalogo.por_nombre(dataset)
+        if instancia is None:
+            print(f"⚠️  La instancia {dataset} no está en el catálogo")
+            continue
+        demanda, puntajes = instancia.demanda, instancia.puntajes
+        num_semanas = instancia.semanas
+
+        if args.todas:
+            soluciones = list(iterar_soluciones_json(ruta_resultado))
+        else:
+            solucion = cargar_solucion(ruta_resultado)
+            soluciones = [solucion] if solucion is not None else []
+
+        print(f"🔍 {ruta_resultado.name} ({dataset}): {len(soluciones)} solución(es)")
+        for i, solucion in enumerate(soluciones, start=1):
+            validacion = validar_solucion(solucion, puntajes, demanda, num_semanas)
+            if not (validacion['factible'] and validacion['objetivo_coincide']):
+                invalidas += 1
+            _imprimir_validacion(f"solución {i}", validacion)
+
+    print("-" * 50)
+    print(f"Soluciones inválidas: {invalidas}")
+
+
+if __name__ == "__main__":
+    main()